@@ -50,8 +50,8 @@ def main():
             # Gera relatório com artigos coletados
             if all_articles:
                 daily_report = agent.report_generator.generate_daily_report(all_articles)
-                html_path = agent.report_generator.save_report(daily_report, format='html')
-                json_path = agent.report_generator.save_report(daily_report, format='json')
+                paths = agent.report_generator.save_report_multi(daily_report, ('html', 'json'))
+                html_path, json_path = paths['html'], paths['json']
                 
                 logger.info(f"📊 Relatório gerado: {len(all_articles)} artigos")
                 logger.info(f"💾 Relatórios salvos: {html_path}, {json_path}")
@@ -81,8 +81,8 @@ def main():
             # Gera relatório
             if all_articles:
                 daily_report = agent.report_generator.generate_daily_report(all_articles)
-                html_path = agent.report_generator.save_report(daily_report, format='html')
-                json_path = agent.report_generator.save_report(daily_report, format='json')
+                paths = agent.report_generator.save_report_multi(daily_report, ('html', 'json'))
+                html_path, json_path = paths['html'], paths['json']
                 
                 logger.info(f"📊 Relatório gerado: {len(all_articles)} artigos")
                 logger.info(f"💾 Relatórios salvos: {html_path}, {json_path}")
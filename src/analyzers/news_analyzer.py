@@ -13,6 +13,9 @@ from datetime import datetime
 from ..models import NewsArticle
 from src.utils.logger import get_logger
 
+# Parser em C (libyaml) quando disponível; SafeLoader puro-Python como fallback
+_FastLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 class NewsAnalyzer:
     """Analisador de relevância e categorização de notícias de seguros"""
     
@@ -58,7 +61,7 @@ class NewsAnalyzer:
         """
         try:
             with open(path, 'r', encoding='utf-8') as file:
-                config = yaml.safe_load(file)
+                config = yaml.load(file, Loader=_FastLoader)
                 self.logger.info(f"Configuração carregada de: {path}")
                 return config
         except FileNotFoundError:
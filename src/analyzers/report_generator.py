@@ -7,7 +7,7 @@ VERSÃO COMPLETA - COM DEDUPLICAÇÃO E SEÇÃO "OUTROS ARTIGOS"
 import os
 import json
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 from src.models import NewsArticle, DailyReport
@@ -15,6 +15,20 @@ from src.utils.logger import get_logger
 
 logger = get_logger("report_generator")
 
+# orjson (opcional) serializa o relatório bem mais rápido que o json da stdlib; ambos geram bytes UTF-8
+try:
+    import orjson as _orjson
+    
+    def _json_dumps_pretty(obj: Any) -> bytes:
+        try:
+            return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2 | _orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Tipo que o orjson não conhece: mantém o comportamento do json da stdlib
+            return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+except ImportError:
+    def _json_dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
 class ReportGenerator:
     """
     Gerador de relatórios diários
@@ -509,73 +523,82 @@ class ReportGenerator:
         Returns:
             Caminho do arquivo salvo
         """
-        date_str = report.date.strftime('%Y-%m-%d')
+        return self.save_report_multi(report, formats=(format,))[format.lower()]
+    
+    def save_report_multi(self, report: DailyReport, formats: Tuple[str, ...] = ('html', 'json')) -> Dict[str, str]:
+        """
+        Salva o relatório em vários formatos de uma vez (data formatada uma só vez)
         
-        if format.lower() == 'html':
-            filename = f"daily_report_{date_str}.html"
-            filepath = self.output_dir / filename
-            
-            html_content = self.generate_html_report(report)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+        Args:
+            report: Relatório a ser salvo
+            formats: Formatos desejados ('html', 'json')
             
-            self.logger.info(f"Relatório HTML salvo: {filepath}")
-            return str(filepath)
+        Returns:
+            Dicionário formato -> caminho do arquivo salvo
+        """
+        savers = {'html': self._save_html, 'json': self._save_json}
+        date_str = report.date.strftime('%Y-%m-%d')
         
-        elif format.lower() == 'json':
-            filename = f"daily_report_{date_str}.json"
-            filepath = self.output_dir / filename
-            
-            # Converte para dict serializável COM OUTROS ARTIGOS
-            other_articles = getattr(report, 'other_articles', [])
-            
-            report_dict = {
-                'date': report.date.isoformat(),
-                'total_articles': report.total_articles,
-                'summary': report.summary,
-                'top_articles': [
-                    {
-                        'title': art.title,
-                        'url': art.url,
-                        'source': art.source,
-                        'summary': art.summary,
-                        'date_published': art.date_published.isoformat() if hasattr(art, 'date_published') and art.date_published else None,
-                        'region': self._convert_to_serializable(getattr(art, 'region', None)),
-                        'relevance_score': getattr(art, 'relevance_score', None)
-                    }
-                    for art in report.top_articles
-                ],
-                'other_articles': [
-                    {
-                        'title': art.title,
-                        'url': art.url,
-                        'source': art.source,
-                        'summary': art.summary,
-                        'date_published': art.date_published.isoformat() if hasattr(art, 'date_published') and art.date_published else None,
-                        'region': self._convert_to_serializable(getattr(art, 'region', None)),
-                        'relevance_score': getattr(art, 'relevance_score', None)
-                    }
-                    for art in other_articles
-                ],
-                'open_insurance_articles': [
-                    {
-                        'title': art.title,
-                        'url': art.url,
-                        'source': art.source,
-                        'summary': art.summary,
-                        'region': self._convert_to_serializable(getattr(art, 'region', None))
-                    }
-                    for art in report.open_insurance_articles
-                ],
-                'articles_by_region': report.articles_by_region
-            }
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(report_dict, f, ensure_ascii=False, indent=2)
-            
-            self.logger.info(f"Relatório JSON salvo: {filepath}")
-            return str(filepath)
+        paths = {}
+        for fmt in formats:
+            saver = savers.get(fmt.lower())
+            if saver is None:
+                raise ValueError(f"Formato não suportado: {fmt}")
+            paths[fmt.lower()] = saver(report, date_str)
+        return paths
+    
+    def _save_html(self, report: DailyReport, date_str: str) -> str:
+        """Grava o relatório HTML"""
+        filepath = self.output_dir / f"daily_report_{date_str}.html"
         
-        else:
-            raise ValueError(f"Formato não suportado: {format}")
+        html_content = self.generate_html_report(report)
+        
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        
+        self.logger.info(f"Relatório HTML salvo: {filepath}")
+        return str(filepath)
+    
+    def _save_json(self, report: DailyReport, date_str: str) -> str:
+        """Grava o relatório JSON (orjson quando disponível)"""
+        filepath = self.output_dir / f"daily_report_{date_str}.json"
+        
+        # Converte para dict serializável COM OUTROS ARTIGOS
+        other_articles = getattr(report, 'other_articles', [])
+        
+        report_dict = {
+            'date': report.date.isoformat(),
+            'total_articles': report.total_articles,
+            'summary': report.summary,
+            'top_articles': [self._article_dict(art) for art in report.top_articles],
+            'other_articles': [self._article_dict(art) for art in other_articles],
+            'open_insurance_articles': [
+                {
+                    'title': art.title,
+                    'url': art.url,
+                    'source': art.source,
+                    'summary': art.summary,
+                    'region': self._convert_to_serializable(getattr(art, 'region', None))
+                }
+                for art in report.open_insurance_articles
+            ],
+            'articles_by_region': report.articles_by_region
+        }
+        
+        with open(filepath, 'wb') as f:
+            f.write(_json_dumps_pretty(report_dict))
+        
+        self.logger.info(f"Relatório JSON salvo: {filepath}")
+        return str(filepath)
+    
+    def _article_dict(self, art: NewsArticle) -> Dict[str, Any]:
+        """Artigo no formato do relatório JSON (artigos principais e outros artigos)"""
+        return {
+            'title': art.title,
+            'url': art.url,
+            'source': art.source,
+            'summary': art.summary,
+            'date_published': art.date_published.isoformat() if hasattr(art, 'date_published') and art.date_published else None,
+            'region': self._convert_to_serializable(getattr(art, 'region', None)),
+            'relevance_score': getattr(art, 'relevance_score', None)
+        }
@@ -0,0 +1,7 @@
+"""
+Módulo de deduplicação de artigos já enviados
+"""
+
+from .manager import DeduplicationManager
+
+__all__ = ['DeduplicationManager']
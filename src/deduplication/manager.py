@@ -4,17 +4,37 @@ Evita que artigos já enviados apareçam novamente em relatórios futuros
 """
 
 import json
+import sqlite3
 import hashlib
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Set, Dict, Any
+from typing import List, Set, Dict, Any, Optional
 from dataclasses import dataclass
 
 from src.models import NewsArticle
 from src.utils.logger import get_logger
+from src.utils.url_key import canonical_url
 
 logger = get_logger("deduplication_manager")
 
+
+def _url_hash(article: NewsArticle) -> str:
+    """Hash da URL canônica do artigo (chave url_* do histórico)"""
+    return hashlib.md5(canonical_url(article.url).encode('utf-8')).hexdigest()
+
+
+def _legacy_url_hash(article: NewsArticle) -> Optional[str]:
+    """Hash da URL crua, usado nas chaves gravadas antes da canonicalização (None se coincide)"""
+    if canonical_url(article.url) == article.url:
+        return None
+    return hashlib.md5(article.url.encode('utf-8')).hexdigest()
+
+
+def _title_hash(article: NewsArticle) -> str:
+    """Hash do título normalizado (chave title_* do histórico)"""
+    return hashlib.md5(article.title.lower().strip().encode('utf-8')).hexdigest()
+
+
 @dataclass
 class ArticleFingerprint:
     """Impressão digital de um artigo para deduplicação"""
@@ -60,45 +80,123 @@ class DeduplicationManager:
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         
-        self.fingerprints_file = self.storage_dir / "sent_articles.json"
+        self.db_file = self.storage_dir / "sent_articles.db"
+        self.fingerprints_file = self.storage_dir / "sent_articles.json"  # formato antigo (migrado)
         self.sent_articles: Dict[str, ArticleFingerprint] = {}
         
         self.logger = logger
+        self._conn: Optional[sqlite3.Connection] = None
+        self._open_db()
         self._load_sent_articles()
         
         self.logger.info(f"Deduplication Manager inicializado - {len(self.sent_articles)} artigos no histórico")
     
+    def _open_db(self):
+        """Abre (ou cria) o banco SQLite do histórico; sem ele não há persistência (só o JSON antigo é lido)"""
+        try:
+            self._conn = sqlite3.connect(str(self.db_file), isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sent ("
+                "key TEXT PRIMARY KEY, url_hash TEXT, title_hash TEXT, content_hash TEXT, "
+                "date_sent REAL, source TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS sent_date ON sent(date_sent)")
+        except sqlite3.Error as e:
+            self.logger.error(f"Erro ao abrir banco de deduplicação: {e}")
+            self._conn = None
+    
     def _load_sent_articles(self):
         """Carrega histórico de artigos já enviados"""
-        if not self.fingerprints_file.exists():
+        if self._conn is None:
+            self.logger.error("❌ SQLite indisponível - persistência do histórico desativada; "
+                              "usando sent_articles.json apenas para leitura")
+            self.sent_articles = self._read_json()
+        else:
+            try:
+                rows = self._conn.execute(
+                    "SELECT key, url_hash, title_hash, content_hash, date_sent, source FROM sent"
+                ).fetchall()
+                
+                for key, url_hash, title_hash, content_hash, date_sent, source in rows:
+                    self.sent_articles[key] = ArticleFingerprint(
+                        url_hash=url_hash,
+                        title_hash=title_hash,
+                        content_hash=content_hash,
+                        date_sent=datetime.fromtimestamp(date_sent),
+                        source=source
+                    )
+                
+            except sqlite3.Error as e:
+                self.logger.error(f"Erro ao carregar histórico de deduplicação: {e}")
+                self.sent_articles = self._read_json()
+            else:
+                if not self.sent_articles and self.fingerprints_file.exists():
+                    self._migrate_json()
+        
+        if self.sent_articles:
+            self.logger.info(f"Carregado histórico de {len(self.sent_articles)} artigos enviados")
+        else:
             self.logger.info("Nenhum histórico de deduplicação encontrado - iniciando novo")
-            return
+    
+    def _read_json(self) -> Dict[str, ArticleFingerprint]:
+        """Lê o histórico no formato JSON antigo (vazio se não existir ou estiver ilegível)"""
+        if not self.fingerprints_file.exists():
+            return {}
         
         try:
             with open(self.fingerprints_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-            
-            for key, fingerprint_data in data.items():
-                self.sent_articles[key] = ArticleFingerprint.from_dict(fingerprint_data)
-            
-            self.logger.info(f"Carregado histórico de {len(self.sent_articles)} artigos enviados")
-            
+            return {key: ArticleFingerprint.from_dict(value) for key, value in data.items()}
         except Exception as e:
-            self.logger.error(f"Erro ao carregar histórico de deduplicação: {e}")
-            self.sent_articles = {}
+            self.logger.error(f"Erro ao ler histórico JSON de deduplicação: {e}")
+            return {}
     
-    def _save_sent_articles(self):
-        """Salva histórico de artigos enviados"""
+    def _migrate_json(self):
+        """Importa o histórico do JSON antigo para o SQLite (uma única vez)"""
+        fingerprints = self._read_json()
+        self.sent_articles.update(fingerprints)
+        if not fingerprints:
+            return
+        
+        # Só renomeia o JSON depois do commit; se a gravação falhar, ele fica para a próxima execução
+        if not self._insert(fingerprints):
+            self.logger.error("❌ Migração do histórico JSON para SQLite falhou - JSON mantido")
+            return
+        
         try:
-            data = {key: fingerprint.to_dict() for key, fingerprint in self.sent_articles.items()}
-            
-            with open(self.fingerprints_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self.fingerprints_file.rename(self.fingerprints_file.with_suffix('.json.migrated'))
+            self.logger.info(f"📦 Histórico JSON migrado para SQLite - {len(fingerprints)} entradas")
+        except OSError as e:
+            self.logger.error(f"Erro ao renomear histórico JSON migrado: {e}")
+    
+    def _insert(self, fingerprints: Dict[str, ArticleFingerprint]) -> bool:
+        """
+        Grava novas entradas do histórico numa única transação
+        
+        Returns:
+            True se gravou (ou não havia o que gravar), False se não há banco ou a transação falhou
+        """
+        if not fingerprints:
+            return True
+        if self._conn is None:
+            return False
+        
+        rows = [
+            (key, fp.url_hash, fp.title_hash, fp.content_hash, fp.date_sent.timestamp(), fp.source)
+            for key, fp in fingerprints.items()
+        ]
+        try:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany("INSERT OR IGNORE INTO sent VALUES (?, ?, ?, ?, ?, ?)", rows)
             
-            self.logger.debug(f"Histórico de deduplicação salvo - {len(self.sent_articles)} artigos")
+            self.logger.debug(f"Histórico de deduplicação salvo - {len(rows)} novas entradas")
+            return True
             
-        except Exception as e:
+        except sqlite3.Error as e:
             self.logger.error(f"Erro ao salvar histórico de deduplicação: {e}")
+            return False
     
     def _generate_fingerprint(self, article: NewsArticle) -> ArticleFingerprint:
         """
@@ -110,12 +208,9 @@ class DeduplicationManager:
         Returns:
             Fingerprint do artigo
         """
-        # Hash da URL (identificador principal)
-        url_hash = hashlib.md5(article.url.encode('utf-8')).hexdigest()
-        
-        # Hash do título (para detectar títulos similares)
-        title_normalized = article.title.lower().strip()
-        title_hash = hashlib.md5(title_normalized.encode('utf-8')).hexdigest()
+        # Hash da URL (identificador principal) e do título (para detectar títulos similares)
+        url_hash = _url_hash(article)
+        title_hash = _title_hash(article)
         
         # Hash do conteúdo (título + resumo)
         content = f"{article.title} {article.summary}".lower().strip()
@@ -139,19 +234,25 @@ class DeduplicationManager:
         Returns:
             True se for duplicado, False caso contrário
         """
-        fingerprint = self._generate_fingerprint(article)
+        # Só os hashes consultados (o do título apenas se a URL não bateu); o fingerprint
+        # completo — hash de conteúdo, data — só é gerado em mark_as_sent
         
         # Verifica duplicação por URL (mais restritivo)
-        url_key = f"url_{fingerprint.url_hash}"
+        url_key = f"url_{_url_hash(article)}"
         if url_key in self.sent_articles:
             self.logger.debug(f"Artigo duplicado por URL: {article.title[:50]}...")
             return True
         
+        # Histórico antigo (até expirar em cleanup_old_entries) foi chaveado pela URL crua
+        legacy_hash = _legacy_url_hash(article)
+        if legacy_hash is not None and f"url_{legacy_hash}" in self.sent_articles:
+            self.logger.debug(f"Artigo duplicado por URL: {article.title[:50]}...")
+            return True
+        
         # Verifica duplicação por título (menos restritivo)
-        title_key = f"title_{fingerprint.title_hash}"
-        if title_key in self.sent_articles:
+        existing = self.sent_articles.get(f"title_{_title_hash(article)}")
+        if existing is not None:
             # Verifica se é da mesma fonte (evita falsos positivos)
-            existing = self.sent_articles[title_key]
             if existing.source == article.source:
                 self.logger.debug(f"Artigo duplicado por título: {article.title[:50]}...")
                 return True
@@ -196,6 +297,7 @@ class DeduplicationManager:
             return
         
         added_count = 0
+        new_entries: Dict[str, ArticleFingerprint] = {}
         
         for article in articles:
             fingerprint = self._generate_fingerprint(article)
@@ -203,16 +305,16 @@ class DeduplicationManager:
             # Adiciona por URL
             url_key = f"url_{fingerprint.url_hash}"
             if url_key not in self.sent_articles:
-                self.sent_articles[url_key] = fingerprint
+                self.sent_articles[url_key] = new_entries[url_key] = fingerprint
                 added_count += 1
             
             # Adiciona por título
             title_key = f"title_{fingerprint.title_hash}"
             if title_key not in self.sent_articles:
-                self.sent_articles[title_key] = fingerprint
+                self.sent_articles[title_key] = new_entries[title_key] = fingerprint
         
-        # Salva histórico atualizado
-        self._save_sent_articles()
+        # Grava só as entradas novas (sem reescrever o histórico inteiro)
+        self._insert(new_entries)
         
         self.logger.info(f"Marcados {added_count} novos artigos como enviados")
         self.logger.info(f"Total no histórico: {len(self.sent_articles)} fingerprints")
@@ -235,7 +337,11 @@ class DeduplicationManager:
             del self.sent_articles[key]
         
         if old_keys:
-            self._save_sent_articles()
+            if self._conn is not None:
+                try:
+                    self._conn.execute("DELETE FROM sent WHERE date_sent < ?", (cutoff_date.timestamp(),))
+                except sqlite3.Error as e:
+                    self.logger.error(f"Erro ao limpar histórico de deduplicação: {e}")
             self.logger.info(f"Removidas {len(old_keys)} entradas antigas do histórico")
     
     def get_statistics(self) -> Dict[str, Any]:
@@ -1,4 +1,4 @@
 # src/email_sender/__init__.py
-from .email_manager import EmailManager
+from .email_manager import BatchAbortedError, EmailManager
 
-__all__ = ["EmailManager"]
+__all__ = ["EmailManager", "BatchAbortedError"]
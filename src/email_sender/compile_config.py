@@ -0,0 +1,50 @@
+# src/email_sender/compile_config.py
+"""
+Pré-compila config/email_config.yaml em src/email_sender/email_config_compiled.py
+(literal Python), para que o EmailManager não precise parsear YAML a cada boot.
+
+Uso:
+    python -m src.email_sender.compile_config [caminho_do_yaml]
+
+O módulo gerado guarda o caminho e o mtime do YAML de origem; se o YAML for
+editado depois, o EmailManager ignora o compilado e volta a ler o YAML.
+"""
+from __future__ import annotations
+
+import os
+import pprint
+import sys
+from pathlib import Path
+
+from src.email_sender.email_manager import EmailManager, _parse_yaml_file, _shallow_merge
+
+COMPILED_PATH = Path(__file__).with_name("email_config_compiled.py")
+
+
+def compile_config(config_path: str | os.PathLike = "config/email_config.yaml",
+                   output_path: Path = COMPILED_PATH) -> Path:
+    cfg_path = EmailManager._resolve_config_path(config_path)
+    st = cfg_path.stat()
+    config = _shallow_merge(EmailManager._defaults(), _parse_yaml_file(cfg_path))
+
+    source = (
+        "# Gerado por `python -m src.email_sender.compile_config` — não editar.\n"
+        f"SOURCE_PATH = {str(cfg_path.resolve())!r}\n"
+        f"SOURCE_MTIME_NS = {st.st_mtime_ns!r}\n"
+        f"CONFIG = {pprint.pformat(config, width=120)}\n"
+    )
+    tmp_path = output_path.with_suffix(".py.tmp")
+    tmp_path.write_text(source, encoding="utf-8")
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    out = compile_config(*argv[:1])
+    print(f"✅ Configuração compilada em {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
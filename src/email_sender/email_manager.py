@@ -1,16 +1,26 @@
 # src/email_sender/email_manager.py
 from __future__ import annotations
 
+import atexit
+import base64
+import copy
+import functools
+import io
+import json
 import os
-import smtplib
-import ssl
-import socket
-from email import encoders
-from email.mime.base import MIMEBase
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+import re
+import secrets
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from email.charset import Charset
+from email.header import Header
+from email.utils import formataddr, formatdate
 from pathlib import Path
-from typing import Iterable, Optional, Dict, Any, List
+from typing import TYPE_CHECKING, Iterable, Optional, Dict, Any, List, Tuple
+
+if TYPE_CHECKING:
+    import smtplib
+    from email.message import EmailMessage
 
 try:
     from src.utils.logger import get_logger
@@ -23,13 +33,86 @@ except Exception:
         )
         return logging.getLogger(name)
 
+from src.email_sender.smtp_common import header_value, reject_crlf, smtp_classes
+
 logger = get_logger("src.email_sender.email_manager")
 
+# Raiz do repositório (src/email_sender/ -> ../..), resolvida uma única vez
+_PKG_ROOT = Path(__file__).resolve().parents[2]
+
+# Charset reaproveitado na codificação RFC 2047 de cabeçalhos (evita reconstruí-lo a cada envio)
+_UTF8 = Charset("utf-8")
+
+# Validação sintática simples, feita uma vez ao carregar a config (não a cada envio)
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# Blocos múltiplos de 57 bytes viram linhas base64 completas de 76 chars (sem padding no meio)
+_B64_CHUNK = 57 * 1024
+
+# Pool de envio (SMTP é I/O-bound); criado só no primeiro envio assíncrono
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+# Config pré-compilada (compile_config.py): ((mtime_ns, tamanho) do .py gerado, namespace executado)
+_COMPILED_PATH = Path(__file__).with_name("email_config_compiled.py")
+_COMPILED: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+
+# Cache do YAML já mesclado com os defaults, chaveado por (caminho, mtime_ns, tamanho).
+# Evita reabrir/reparsear o arquivo a cada EmailManager() no mesmo processo; o tamanho
+# pega reescritas dentro da mesma granularidade de mtime do filesystem.
+_CONFIG_CACHE: Dict[Tuple[Path, int, int], Dict[str, Any]] = {}
+
+# Conexões SMTP autenticadas compartilhadas entre instâncias de EmailManager: uma por
+# thread (smtplib não é thread-safe) e por (host, porta, tls, usuário, ipv4). Todas ficam
+# também em _CONNECTIONS para que o atexit consiga encerrá-las.
+_CONN_LOCAL = threading.local()
+_CONNECTIONS: List[Tuple[tuple, Any]] = []
+_CONN_LOCK = threading.Lock()
+
+# Defaults construídos uma única vez; nunca mutar — use EmailManager._defaults() para uma cópia
+_DEFAULT_CONFIG: Dict[str, Any] = {
+    "recipients": {"alerts": [], "daily_report": [], "errors": []},
+    "smtp": {"server": "smtp.gmail.com", "port": 587, "use_tls": True, "sender_name": "Insurance News Agent"},
+    "templates": {
+        "alert": {"subject": "Alerta - Insurance News Agent - {alert_type}", "template_file": "alert_template.html"},
+        "daily_report": {"subject": "Relatório Diário - Notícias de Seguros - {date}", "template_file": "daily_report_template.html"},
+        "error": {"subject": "Erro - Insurance News Agent - {error_type}", "template_file": "error_template.html"},
+    },
+}
+
+class BatchAbortedError(RuntimeError):
+    """
+    Lote interrompido por excesso de falhas (cota, greylist, auth...).
+    `results` traz o resultado por item (None = não coletado antes do abort) e
+    `not_attempted` os itens que nem chegaram a ser enviados, para retry com backoff.
+    """
+    def __init__(self, message: str, results: List[Optional[bool]], not_attempted: List[Dict[str, Any]]):
+        super().__init__(message)
+        self.results = results
+        self.not_attempted = not_attempted
+
 def _split_emails(value: Optional[str]) -> List[str]:
     if not value:
         return []
     return [e.strip() for e in value.split(",") if e.strip()]
 
+def _normalize_emails(value: Any) -> Tuple[str, ...]:
+    """Aceita lista ou string "a,b"; retorna tupla válida e sem duplicatas (grafia original preservada)."""
+    if isinstance(value, str):
+        raw = _split_emails(value)
+    else:
+        raw = [e for item in (value or []) for e in _split_emails(str(item))]
+    out: Dict[str, str] = {}
+    for e in raw:
+        if not _EMAIL_RE.match(e):
+            # Um RCPT TO inválido derrubaria o envio inteiro
+            logger.warning(f"⚠️ Destinatário inválido ignorado: {e!r}")
+            continue
+        # Deduplica sem diferenciar maiúsculas (User@x.com e user@x.com não viram dois RCPT TO),
+        # mas envia a primeira grafia: a parte local pode ser case-sensitive (RFC 5321)
+        out.setdefault(e.casefold(), e)
+    return tuple(out.values())
+
 def _env_bool(name: str, default: bool) -> bool:
     v = os.getenv(name)
     if v is None:
@@ -45,52 +128,327 @@ def _shallow_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str,
             out[k] = v
     return out
 
+@functools.lru_cache(maxsize=8)
+def _resolve_config_path(path: str | os.PathLike) -> Path:
+    p = Path(path)
+    if p.is_file():
+        return p
+    candidate = _PKG_ROOT / path
+    return candidate if candidate.is_file() else p
+
+def _parse_yaml_file(cfg_path: Path) -> Dict[str, Any]:
+    """Lê o YAML de configuração; retorna {} se o conteúdo não for um mapeamento."""
+    import yaml
+    # Parser em C (libyaml) quando disponível; SafeLoader puro-Python como fallback
+    try:
+        from yaml import CSafeLoader as _Loader
+    except ImportError:
+        from yaml import SafeLoader as _Loader
+    # Arquivo pequeno: um único os.read, sem a camada TextIOWrapper/newline do open()
+    fd = os.open(cfg_path, os.O_RDONLY)
+    try:
+        raw = os.read(fd, os.fstat(fd).st_size)
+    finally:
+        os.close(fd)
+    data = yaml.load(raw.decode("utf-8"), Loader=_Loader) or {}
+    return data if isinstance(data, dict) else {}
+
+# orjson (opcional) é bem mais rápido que o json da stdlib; ambos trabalham em bytes aqui
+try:
+    import orjson as _orjson
+    _json_loads = _orjson.loads
+    _json_dumps = _orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+def _sidecar_path(cfg_path: Path) -> Path:
+    return cfg_path.with_name(cfg_path.name + ".cache.json")
+
+def _load_yaml_with_sidecar(cfg_path: Path, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Lê `<config>.cache.json` quando ele é tão novo quanto o YAML (json é bem mais
+    rápido de parsear); caso contrário parseia o YAML e regrava o sidecar.
+    """
+    sidecar = _sidecar_path(cfg_path)
+    try:
+        if sidecar.stat().st_mtime_ns >= mtime_ns:
+            data = _json_loads(sidecar.read_bytes())
+            if isinstance(data, dict):
+                return data
+    except (OSError, ValueError):
+        pass
+
+    data = _parse_yaml_file(cfg_path)
+    _write_sidecar(cfg_path, data)
+    return data
+
+def _write_sidecar(cfg_path: Path, data: Dict[str, Any]) -> None:
+    sidecar = _sidecar_path(cfg_path)
+    tmp = sidecar.with_name(sidecar.name + ".tmp")
+    try:
+        tmp.write_bytes(_json_dumps(data))
+        os.replace(tmp, sidecar)
+    except (OSError, TypeError, ValueError) as e:
+        # FS somente leitura ou valor não serializável: segue só com o YAML
+        logger.debug(f"Sidecar JSON não gravado ({sidecar}): {e}")
+        try: tmp.unlink()
+        except OSError: pass
+
+def _write_yaml_atomic(cfg_path: Path, data: Dict[str, Any]) -> None:
+    """Grava o YAML num .tmp e troca com os.replace (nunca deixa o arquivo pela metade)."""
+    import yaml
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    tmp = cfg_path.with_name(cfg_path.name + ".tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as f:
+            yaml.dump(data, f, Dumper=dumper, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        os.replace(tmp, cfg_path)
+    except BaseException:
+        try: tmp.unlink()
+        except OSError: pass
+        raise
+
+def _load_compiled_config(cfg_path: Path, mtime_ns: int) -> Optional[Dict[str, Any]]:
+    """
+    Retorna o CONFIG gerado por `python -m src.email_sender.compile_config`,
+    desde que tenha sido compilado a partir deste mesmo arquivo e mtime.
+    O módulo é recarregado quando o .py gerado muda (recompilação com o processo vivo).
+    """
+    global _COMPILED
+    try:
+        st = os.stat(_COMPILED_PATH)
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+    if _COMPILED is None or _COMPILED[0] != stamp:
+        # exec direto do fonte (sem sys.modules nem .pyc, que só guarda mtime em segundos)
+        namespace: Dict[str, Any] = {}
+        try:
+            exec(compile(_COMPILED_PATH.read_bytes(), str(_COMPILED_PATH), "exec"), namespace)
+        except Exception as e:
+            logger.warning(f"email_config_compiled.py ilegível ({e}); relendo YAML.")
+            return None
+        _COMPILED = (stamp, namespace)
+    compiled = _COMPILED[1]
+    if compiled.get("SOURCE_PATH") != str(cfg_path.resolve()) or compiled.get("SOURCE_MTIME_NS") != mtime_ns:
+        logger.warning("email_config_compiled.py desatualizado; relendo YAML.")
+        return None
+    return compiled.get("CONFIG")
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                try:    workers = int(os.getenv("EMAIL_WORKERS", "8"))
+                except ValueError: workers = 8
+                _EXECUTOR = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="smtp")
+    return _EXECUTOR
+
+def _encode_file_base64(path: Path) -> str:
+    """Codifica o arquivo em base64 (linhas de 76 chars) lendo-o em blocos."""
+    buf = io.BytesIO()
+    with path.open("rb") as f:
+        while True:
+            block = f.read(_B64_CHUNK)
+            if not block:
+                break
+            buf.write(base64.encodebytes(block))
+    return buf.getvalue().decode("ascii")
+
+def _attach_streaming(msg: "EmailMessage", path: Path) -> None:
+    from email.message import MIMEPart
+    part = MIMEPart()
+    part["Content-Type"] = "application/octet-stream"
+    # Payload já está em base64; não passar pelo content manager (que releria tudo em memória)
+    part["Content-Transfer-Encoding"] = "base64"
+    part["Content-Disposition"] = f'attachment; filename="{path.name}"'
+    part.set_payload(_encode_file_base64(path))
+    msg.make_mixed()
+    msg.attach(part)
+
+def _write_b64_crlf(out: io.BytesIO, data: bytes) -> None:
+    """base64 em linhas de 76 chars terminadas em CRLF, escrito direto no buffer."""
+    for i in range(0, len(data), _B64_CHUNK):
+        out.write(base64.encodebytes(data[i:i + _B64_CHUNK]).replace(b"\n", b"\r\n"))
+
+def _encoded_body(html_body: str | bytes, body_cache: Optional[Dict[int, bytes]] = None) -> bytes:
+    """
+    Corpo HTML em base64/CRLF. Dentro de um send_batch o mesmo relatório pode ir para
+    várias listas: `body_cache` (por id do objeto, vivo durante o lote) evita recodificá-lo.
+    """
+    key = id(html_body)
+    if body_cache is not None and key in body_cache:
+        return body_cache[key]
+    # Corpo já em UTF-8 (bytes) é usado direto; str é codificado uma única vez
+    body = html_body if isinstance(html_body, bytes) else html_body.encode("utf-8")
+    out = io.BytesIO()
+    _write_b64_crlf(out, body)
+    encoded = out.getvalue()
+    if body_cache is not None:
+        body_cache[key] = encoded
+    return encoded
+
+def _message_preamble(from_hdr: str) -> bytes:
+    """Cabeçalhos que não mudam entre envios do mesmo manager (montados uma vez)."""
+    return f"From: {from_hdr}\r\nMIME-Version: 1.0\r\n".encode("utf-8")
+
+def _build_message_fast(
+    subject: str,
+    html_body: str | bytes,
+    preamble: bytes,
+    to_header: str,
+    reply_to: Optional[str] = None,
+    attachments: Optional[List[Path]] = None,
+    body_cache: Optional[Dict[int, bytes]] = None,
+) -> bytes:
+    """
+    Monta a mensagem direto em bytes (sem a árvore email.mime): text/html simples
+    quando não há anexos, multipart/mixed caso contrário. `attachments` deve conter
+    só caminhos existentes; arquivos são lidos em blocos.
+    """
+    out = io.BytesIO()
+    out.write(preamble)
+    headers = [
+        f"To: {reject_crlf(to_header)}",
+        f"Subject: {header_value(subject)}",
+        f"Date: {formatdate(localtime=True)}",
+    ]
+    if reply_to:
+        headers.append(f"Reply-To: {header_value(reply_to)}")
+    if not attachments:
+        out.write("\r\n".join(headers).encode("utf-8"))
+        out.write(b'\r\nContent-Type: text/html; charset="utf-8"\r\n'
+                  b"Content-Transfer-Encoding: base64\r\n\r\n")
+        out.write(_encoded_body(html_body, body_cache))
+        return out.getvalue()
+
+    boundary = f"=_{secrets.token_hex(16)}".encode("ascii")
+    headers.append(f'Content-Type: multipart/mixed; boundary="{boundary.decode("ascii")}"')
+    out.write("\r\n".join(headers).encode("utf-8"))
+    out.write(b"\r\n\r\n")
+
+    out.write(b"--" + boundary + b"\r\n")
+    out.write(b'Content-Type: text/html; charset="utf-8"\r\n'
+              b"Content-Transfer-Encoding: base64\r\n\r\n")
+    out.write(_encoded_body(html_body, body_cache))
+
+    for path in attachments:
+        filename = path.name.replace('"', "")
+        if not filename.isascii():
+            filename = Header(filename, _UTF8).encode()
+        out.write(b"--" + boundary + b"\r\n")
+        out.write(b"Content-Type: application/octet-stream\r\n"
+                  b"Content-Transfer-Encoding: base64\r\n")
+        out.write(f'Content-Disposition: attachment; filename="{filename}"\r\n\r\n'.encode("ascii"))
+        with path.open("rb") as f:
+            while True:
+                block = f.read(_B64_CHUNK)
+                if not block:
+                    break
+                out.write(base64.encodebytes(block).replace(b"\n", b"\r\n"))
+
+    out.write(b"--" + boundary + b"--\r\n")
+    return out.getvalue()
+
+def _quit_quietly(smtp: Optional[smtplib.SMTP]) -> None:
+    """QUIT educado; se a conexão já caiu, apenas fecha o socket."""
+    if smtp is None:
+        return
+    try:
+        smtp.quit()
+    except Exception:
+        try: smtp.close()
+        except Exception: pass
+
+def _close_connections() -> None:
+    """Encerra todas as conexões compartilhadas (só no fim do processo, via atexit)."""
+    with _CONN_LOCK:
+        closing = list(_CONNECTIONS)
+        _CONNECTIONS.clear()
+    for _, server in closing:
+        _quit_quietly(server)
+
+atexit.register(_close_connections)
+
+# smtplib/ssl/email.message só são importados no primeiro envio: quem só lê a config
+# (dry-run, scripts de setup, sem credenciais) não paga esse custo no boot.
+_SMTPLIB = None
+
+def _smtplib():
+    global _SMTPLIB
+    if _SMTPLIB is None:
+        import smtplib
+        _SMTPLIB = smtplib
+    return _SMTPLIB
+
 class EmailManager:
     def __init__(self, config_path: str | os.PathLike = "config/email_config.yaml"):
         self.config_path = self._resolve_config_path(config_path)
         self.config = self._load_config_tolerant(self.config_path)
         self._apply_env_overrides()
-        s = self.config.get("smtp", {})
-        logger.info(f"🔠 Recipients: {self.config.get('recipients', {})}")
-        logger.info(f"🔠 SMTP server={s.get('server')} port={s.get('port')} use_tls={s.get('use_tls')} sender_name={s.get('sender_name')}")
+        self.refresh_env()
+        # E-mails adiados com defer=True, enviados juntos em flush()
+        self._pending: List[Dict[str, Any]] = []
+        # Base64 dos corpos já montados, só enquanto um send_batch está em andamento
+        self._body_cache: Optional[Dict[int, bytes]] = None
+        self._templates = None
+        # Só contagens: evita repr() das listas a cada boot e não expõe endereços no log
+        logger.debug(f"🔠 Config carregada: keys={list(self.config)} "
+                     f"recipients={ {k: len(v) for k, v in self._recipients_cache.items()} }")
+        logger.info(f"🔠 SMTP server={self._smtp_host} port={self._smtp_port} use_tls={self._use_tls} sender_name={self._sender_name}")
 
-    @staticmethod
-    def _resolve_config_path(path: str | os.PathLike) -> Path:
-        p = Path(path)
-        if p.is_file():
-            return p
-        candidate = Path(__file__).resolve().parents[2] / path
-        return candidate if candidate.is_file() else p
+    _resolve_config_path = staticmethod(_resolve_config_path)
+
+    def refresh_env(self) -> None:
+        """Relê credenciais e flags SMTP do ambiente (útil em daemons de longa duração)."""
+        self._creds = (os.getenv("GMAIL_EMAIL"), os.getenv("GMAIL_APP_PASSWORD"))
+        self._send_enabled = all(self._creds)
+        self._debug_smtp = _env_bool("SMTP_DEBUG", False)
+        self._force_ipv4 = _env_bool("SMTP_FORCE_IPV4", False)
+        # EMAIL_FAST_BUILD=0 volta para a montagem via email.mime (escape hatch)
+        self._fast_build = _env_bool("EMAIL_FAST_BUILD", True)
+        self._from_header = formataddr((self._sender_name, self._creds[0] or ""))
+        self._preamble = _message_preamble(self._from_header)
+        # Chave da conexão compartilhada no módulo (ver _CONN_LOCAL)
+        self._conn_key = (self._smtp_host, self._smtp_port, self._use_tls, self._creds[0], self._force_ipv4)
 
     @staticmethod
     def _defaults() -> Dict[str, Any]:
-        return {
-            "recipients": {"alerts": [], "daily_report": [], "errors": []},
-            "smtp": {"server": "smtp.gmail.com", "port": 587, "use_tls": True, "sender_name": "Insurance News Agent"},
-            "templates": {
-                "alert": {"subject": "Alerta - Insurance News Agent - {alert_type}", "template_file": "alert_template.html"},
-                "daily_report": {"subject": "Relatório Diário - Notícias de Seguros - {date}", "template_file": "daily_report_template.html"},
-                "error": {"subject": "Erro - Insurance News Agent - {error_type}", "template_file": "error_template.html"},
-            },
-        }
+        # Cópia profunda: o chamador pode mutar (ex.: _apply_env_overrides)
+        return copy.deepcopy(_DEFAULT_CONFIG)
 
     def _load_config_tolerant(self, cfg_path: Path) -> Dict[str, Any]:
-        base = self._defaults()
         try:
-            if not cfg_path.exists():
-                logger.warning(f"Config {cfg_path} não encontrada; usando defaults.")
-                return base
             try:
-                import yaml
-            except Exception as e:
-                logger.error(f"PyYAML indisponível ({e}); usando defaults.")
-                return base
-            with cfg_path.open("r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-            return _shallow_merge(base, data if isinstance(data, dict) else {})
+                st = cfg_path.stat()
+            except FileNotFoundError:
+                logger.warning(f"Config {cfg_path} não encontrada; usando defaults.")
+                return self._defaults()
+            abs_path = cfg_path.absolute()
+            key = (abs_path, st.st_mtime_ns, st.st_size)
+            cached = _CONFIG_CACHE.get(key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+            merged = _load_compiled_config(cfg_path, st.st_mtime_ns)
+            if merged is None:
+                try:
+                    data = _load_yaml_with_sidecar(cfg_path, st.st_mtime_ns)
+                except ImportError as e:
+                    logger.error(f"PyYAML indisponível ({e}); usando defaults.")
+                    return self._defaults()
+                # Mescla direto sobre a constante: o resultado só sai daqui via deepcopy
+                merged = _shallow_merge(_DEFAULT_CONFIG, data)
+            # Descarta versões antigas do mesmo arquivo antes de guardar a nova
+            for stale in [k for k in _CONFIG_CACHE if k[0] == abs_path]:
+                del _CONFIG_CACHE[stale]
+            _CONFIG_CACHE[key] = merged
+            return copy.deepcopy(merged)
         except Exception as e:
             logger.error(f"Config YAML inválida ({cfg_path}); usando defaults. Erro: {e}")
-            return base
+            return self._defaults()
 
     def _apply_env_overrides(self) -> None:
         rec = self.config.setdefault("recipients", {})
@@ -99,11 +457,19 @@ class EmailManager:
         env_errors = _split_emails(os.getenv("EMAIL_RECIPIENTS_ERRORS"))
 
         if env_daily:  rec["daily_report"] = env_daily
-        else:          rec.setdefault("daily_report", [])
         if env_alerts: rec["alerts"] = env_alerts
-        else:          rec.setdefault("alerts", [])
         if env_errors: rec["errors"] = env_errors
-        else:          rec.setdefault("errors", [])
+        # Listas definidas por ENV: add_recipient grava só no YAML e não as altera
+        self._env_recipient_keys = frozenset(
+            key for key, env in (("daily_report", env_daily), ("alerts", env_alerts), ("errors", env_errors)) if env
+        )
+        # Normaliza todas as listas uma única vez (YAML pode trazer "a,b" como string)
+        for key in ("daily_report", "alerts", "errors", *rec):
+            rec[key] = _normalize_emails(rec.get(key))
+        # (tupla, cabeçalho To já montado) por lista, consultado direto em send_email
+        self._recipients_cache: Dict[str, Tuple[Tuple[str, ...], str]] = {
+            key: (emails, ", ".join(emails)) for key, emails in rec.items()
+        }
 
         # Overrides SMTP opcionais
         smtp = self.config.setdefault("smtp", {})
@@ -115,100 +481,356 @@ class EmailManager:
             smtp["use_tls"] = _env_bool("SMTP_USE_TLS", smtp.get("use_tls", True))
         if os.getenv("SMTP_SENDER_NAME"): smtp["sender_name"] = os.getenv("SMTP_SENDER_NAME")
 
+        # Resolvidos uma única vez; _connect e refresh_env não voltam a consultar o dict
+        self._smtp_host = smtp.get("server") or "smtp.gmail.com"
+        try:
+            self._smtp_port = int(smtp.get("port", 587))
+        except (TypeError, ValueError):
+            logger.warning("smtp.port inválido (%s); usando 587", smtp.get("port"))
+            self._smtp_port = 587
+        self._use_tls = bool(smtp.get("use_tls", True))
+        self._sender_name = smtp.get("sender_name") or "Insurance News Agent"
+
     def send_email(
         self,
         subject: str,
-        html_body: str,
+        html_body: str | bytes,
         list_key: str = "daily_report",
         attachments: Optional[Iterable[os.PathLike | str]] = None,
         reply_to: Optional[str] = None,
     ) -> bool:
-        gmail_user = os.getenv("GMAIL_EMAIL")
-        gmail_pass = os.getenv("GMAIL_APP_PASSWORD")
-        if not gmail_user or not gmail_pass:
-            logger.error("❌ GMAIL_EMAIL e/ou GMAIL_APP_PASSWORD não configurados")
+        if not self._can_send():
             return False
+        gmail_user = self._creds[0]
 
-        smtp_cfg = self.config.get("smtp", {})
-        server = smtp_cfg.get("server", "smtp.gmail.com")
-        try:    port = int(smtp_cfg.get("port", 587))
-        except: port = 587
-        use_tls = bool(smtp_cfg.get("use_tls", True))
-        sender_name = smtp_cfg.get("sender_name", "Insurance News Agent")
-
-        recipients = self.config.get("recipients", {}).get(list_key, [])
+        # Já normalizada (tupla, sem duplicatas) e com o To pronto, em _apply_env_overrides
+        recipients, to_header = self._recipients_cache.get(list_key, ((), ""))
         if not recipients:
             logger.error(f"❌ Lista de destinatários vazia para '{list_key}'")
             return False
 
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = f"{sender_name} <{gmail_user}>"
-        msg["To"] = ", ".join(recipients)
-        if reply_to:
-            msg["Reply-To"] = reply_to
-        msg.attach(MIMEText(html_body, "html", "utf-8"))
-
+        files: List[Path] = []
         for fpath in (attachments or []):
             p = Path(fpath)
             if not p.exists():
                 logger.warning(f"Anexo não encontrado e ignorado: {p}")
                 continue
-            part = MIMEBase("application", "octet-stream")
-            part.set_payload(p.read_bytes())
-            encoders.encode_base64(part)
-            part.add_header("Content-Disposition", f'attachment; filename="{p.name}"')
-            msg.attach(part)
-
-        debug_smtp = _env_bool("SMTP_DEBUG", False)
-        force_ipv4 = _env_bool("SMTP_FORCE_IPV4", False)
-
-        # Monkey-patch temporário para forçar IPv4 (contorna ambientes sem IPv6)
-        orig_getaddrinfo = socket.getaddrinfo
-        def only_v4(host, port, family=0, type=0, proto=0, flags=0):
-            res = orig_getaddrinfo(host, port, family, type, proto, flags)
-            v4 = [r for r in res if r[0] == socket.AF_INET]
-            return v4 or res
+            files.append(p)
 
+        # Serializa uma única vez; os bytes são reaproveitados se for preciso reconectar
+        # (cabeçalho com CR/LF é recusado nos dois caminhos: ValueError)
         try:
-            if force_ipv4:
-                socket.getaddrinfo = only_v4  # força A-records
+            if self._fast_build:
+                raw = _build_message_fast(subject, html_body, self._preamble, to_header, reply_to, files,
+                                          self._body_cache)
+            else:
+                from email.message import EmailMessage
+                from email.policy import SMTP as _SMTP_POLICY
+                msg = EmailMessage()
+                msg["Subject"] = subject
+                msg["From"] = self._from_header
+                msg["To"] = to_header
+                if reply_to:
+                    msg["Reply-To"] = reply_to
+                if isinstance(html_body, bytes):
+                    msg.set_content(html_body, "text", "html", cte="base64", params={"charset": "utf-8"})
+                else:
+                    msg.set_content(html_body, subtype="html", charset="utf-8", cte="base64")
+                for p in files:
+                    _attach_streaming(msg, p)
+                raw = msg.as_bytes(policy=_SMTP_POLICY)
+        except ValueError as e:
+            logger.error(f"❌ E-mail recusado: {e}")
+            return False
 
-            # Tentativa 1: 587 + STARTTLS
-            try:
-                context = ssl.create_default_context()
-                with smtplib.SMTP(server, 587 if use_tls else port, timeout=30) as smtp:
-                    if debug_smtp: smtp.set_debuglevel(1)
-                    smtp.ehlo()
-                    if use_tls:
-                        smtp.starttls(context=context)
-                        smtp.ehlo()
-                    smtp.login(gmail_user, gmail_pass)
-                    smtp.sendmail(gmail_user, recipients, msg.as_string())
-                logger.info(f"✅ E-mail enviado (via {server}:587 STARTTLS) para {recipients}")
-                return True
-            except smtplib.SMTPAuthenticationError as e:
-                logger.exception(f"❌ Autenticação SMTP (587) falhou: {e}")
-                return False
-            except Exception as e:
-                logger.warning(f"⚠️ 587/STARTTLS falhou: {e} — tentando 465/SSL...")
+        smtplib = _smtplib()
+        try:
+            server = self._get_server()
+        except smtplib.SMTPAuthenticationError as e:
+            logger.exception(f"❌ Autenticação SMTP falhou: {e}")
+            return False
+        except Exception as e:
+            logger.exception(f"❌ Erro inesperado ao conectar no SMTP (após fallback): {e}")
+            return False
 
-            # Tentativa 2: 465 + SSL
+        # Conexão reaproveitada pode ter caído (timeout ocioso do Gmail): reconecta uma vez
+        for attempt in (1, 2):
             try:
-                context = ssl.create_default_context()
-                with smtplib.SMTP_SSL(server, 465, context=context, timeout=30) as smtp:
-                    if debug_smtp: smtp.set_debuglevel(1)
-                    smtp.login(gmail_user, gmail_pass)
-                    smtp.sendmail(gmail_user, recipients, msg.as_string())
-                logger.info(f"✅ E-mail enviado (via {server}:465 SSL) para {recipients}")
+                server.sendmail(gmail_user, recipients, raw)
+                logger.info(f"✅ E-mail enviado (via {server._via}) para {recipients}")
                 return True
-            except smtplib.SMTPAuthenticationError as e:
-                logger.exception(f"❌ Autenticação SMTP (465) falhou: {e}")
-                return False
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError) as e:
+                self._discard(server)
+                if attempt == 2:
+                    logger.exception(f"❌ Conexão SMTP perdida ao enviar: {e}")
+                    return False
+                logger.warning(f"⚠️ Conexão SMTP perdida ({e}); reconectando...")
+                try:
+                    server = self._get_server()
+                except Exception as e2:
+                    logger.exception(f"❌ Falha ao reconectar no SMTP: {e2}")
+                    return False
             except Exception as e:
-                logger.exception(f"❌ Erro inesperado ao enviar e-mail (após fallback): {e}")
+                logger.exception(f"❌ Erro inesperado ao enviar e-mail: {e}")
                 return False
+        return False
+
+    def add_recipient(self, email: str, category: str = "daily_report") -> bool:
+        """Adiciona um destinatário à lista `category` no YAML e na instância atual."""
+        added = _normalize_emails(email)
+        if not added:
+            logger.error(f"❌ E-mail inválido: {email!r}")
+            return False
+        try:
+            data = _parse_yaml_file(self.config_path) if self.config_path.exists() else {}
+            rec = data.setdefault("recipients", {})
+            current = _normalize_emails(rec.get(category))
+            if added[0].casefold() in {e.casefold() for e in current}:
+                logger.info(f"ℹ️ {added[0]} já está em '{category}'")
+                return True
+            rec[category] = list(current + added)
+            _write_yaml_atomic(self.config_path, data)
+            _write_sidecar(self.config_path, data)
+        except Exception as e:
+            logger.exception(f"❌ Falha ao gravar {self.config_path}: {e}")
+            return False
 
+        # ENV tem precedência sobre o YAML: lista vinda de *_RECIPIENTS não muda em memória
+        if category in self._env_recipient_keys:
+            logger.info(f"✅ {added[0]} adicionado a '{category}' no YAML "
+                        f"(lista atual definida por ENV; vale quando o override for removido)")
+            return True
+
+        # Atualiza só a entrada afetada
+        emails = _normalize_emails(self.config["recipients"].get(category, ()) + added)
+        self.config["recipients"][category] = emails
+        self._recipients_cache[category] = (emails, ", ".join(emails))
+        logger.info(f"✅ {added[0]} adicionado a '{category}'")
+        return True
+
+    # ---------- notificações prontas ----------
+
+    def _can_send(self) -> bool:
+        # Checado antes de renderizar templates: sem credenciais, o HTML seria descartado
+        if not self._send_enabled:
+            logger.error("❌ GMAIL_EMAIL e/ou GMAIL_APP_PASSWORD não configurados")
+        return self._send_enabled
+
+    def _template(self):
+        # Import tardio: o módulo de templates puxa models/logger, desnecessários para send_email puro.
+        # As funções geradoras são do módulo (sem estado); não há instância a criar.
+        if self._templates is None:
+            from src.email_sender import email_template
+            self._templates = email_template
+        return self._templates
+
+    def _dispatch(self, item: Dict[str, Any], defer: bool) -> bool:
+        if defer:
+            self._pending.append(item)
+            return True
+        return self.send_email(**item)
+
+    def send_daily_report(self, report, attachments=None, defer: bool = False) -> bool:
+        """Envia o relatório diário para a lista `daily_report`."""
+        if not self._can_send():
+            return False
+        email = self._template().generate_daily_report_email(report)
+        return self._dispatch({"subject": email["subject"], "html_body": email["body"].encode("utf-8"),
+                               "list_key": "daily_report", "attachments": attachments}, defer)
+
+    def send_open_insurance_alert(self, articles, defer: bool = False) -> bool:
+        """Envia o alerta de Open Insurance para a lista `alerts` (nada a fazer se vazio)."""
+        if not articles:
+            return True
+        if not self._can_send():
+            return False
+        email = self._template().generate_alert_email(articles, "open_insurance")
+        return self._dispatch({"subject": email["subject"], "html_body": email["body"].encode("utf-8"),
+                               "list_key": "alerts"}, defer)
+
+    def send_error_notification(self, error_details: Dict[str, Any], defer: bool = False) -> bool:
+        """Envia a notificação de erro para a lista `errors`."""
+        if not self._can_send():
+            return False
+        email = self._template().generate_error_email(error_details)
+        return self._dispatch({"subject": email["subject"], "html_body": email["body"].encode("utf-8"),
+                               "list_key": "errors"}, defer)
+
+    def send_batch(self, items: Iterable[Dict[str, Any]]) -> List[bool]:
+        """
+        Envia vários e-mails em sequência pela mesma sessão SMTP (um único
+        TCP+TLS+AUTH); cada item contém os kwargs de send_email.
+        """
+        items = list(items)
+        if not items:
+            return []
+        if not self.authenticate():
+            return [False] * len(items)
+        # Corpos codificados só durante o lote (items mantém os objetos vivos); liberados no fim
+        self._body_cache = {}
+        try:
+            return [self.send_email(**kw) for kw in items]
         finally:
-            if force_ipv4:
-                socket.getaddrinfo = orig_getaddrinfo
+            self._body_cache = None
+
+    def send_all(self, report=None, alert_articles=None, error_details: Optional[Dict[str, Any]] = None) -> Dict[str, bool]:
+        """
+        Envia as notificações informadas (relatório, alerta, erro). Com EMAIL_PARALLEL_SENDS=1
+        (ou smtp.parallel_sends no YAML) cada uma vai numa thread/conexão própria do pool;
+        por padrão seguem em sequência numa única sessão, para não esbarrar no rate limit do Gmail.
+        """
+        jobs: Dict[str, Any] = {}
+        if report is not None:
+            jobs["daily_report"] = lambda: self.send_daily_report(report)
+        if alert_articles:
+            jobs["alerts"] = lambda: self.send_open_insurance_alert(alert_articles)
+        if error_details is not None:
+            jobs["errors"] = lambda: self.send_error_notification(error_details)
+
+        parallel = _env_bool("EMAIL_PARALLEL_SENDS", bool(self.config.get("smtp", {}).get("parallel_sends", False)))
+        if not parallel or len(jobs) < 2:
+            return {key: job() for key, job in jobs.items()}
+        executor = _get_executor()
+        futures = {key: executor.submit(job) for key, job in jobs.items()}
+        return {key: fut.result() for key, fut in futures.items()}
+
+    def flush(self) -> List[bool]:
+        """Envia, numa única sessão, tudo que foi adiado com defer=True."""
+        items, self._pending = self._pending, []
+        return self.send_batch(items)
+
+    # ---------- conexão SMTP ----------
+
+    def _connect(self) -> smtplib.SMTP:
+        """Abre e autentica uma conexão nova: 587/STARTTLS e, se falhar, 465/SSL."""
+        gmail_user, gmail_pass = self._creds
+        server, port, use_tls = self._smtp_host, self._smtp_port, self._use_tls
+
+        smtplib = _smtplib()
+        import ssl
+        # IPv4 forçado por conexão (sem monkey-patch global de socket.getaddrinfo)
+        smtp_cls, smtp_ssl_cls = smtp_classes(self._force_ipv4)
+
+        # Tentativa 1: 587 + STARTTLS
+        smtp = None
+        try:
+            context = ssl.create_default_context()
+            smtp = smtp_cls(server, 587 if use_tls else port, timeout=30)
+            if self._debug_smtp: smtp.set_debuglevel(1)
+            smtp.ehlo()
+            if use_tls:
+                smtp.starttls(context=context)
+                smtp.ehlo()
+            smtp.login(gmail_user, gmail_pass)
+            smtp._via = f"{server}:587 STARTTLS"
+            return smtp
+        except smtplib.SMTPAuthenticationError:
+            _quit_quietly(smtp)
+            raise
+        except Exception as e:
+            _quit_quietly(smtp)
+            logger.warning(f"⚠️ 587/STARTTLS falhou: {e} — tentando 465/SSL...")
+
+        # Tentativa 2: 465 + SSL
+        smtp = None
+        try:
+            context = ssl.create_default_context()
+            smtp = smtp_ssl_cls(server, 465, context=context, timeout=30)
+            if self._debug_smtp: smtp.set_debuglevel(1)
+            smtp.login(gmail_user, gmail_pass)
+            smtp._via = f"{server}:465 SSL"
+            return smtp
+        except Exception:
+            _quit_quietly(smtp)
+            raise
+
+    def _get_server(self) -> smtplib.SMTP:
+        """Retorna a conexão compartilhada desta thread se ainda responde a NOOP; senão reconecta."""
+        servers = _CONN_LOCAL.__dict__.setdefault("servers", {})
+        server = servers.get(self._conn_key)
+        if server is not None:
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except (_smtplib().SMTPException, OSError):
+                pass
+            self._discard(server)
+        server = self._connect()
+        servers[self._conn_key] = server
+        with _CONN_LOCK:
+            _CONNECTIONS.append((self._conn_key, server))
+        return server
+
+    def _discard(self, server: smtplib.SMTP) -> None:
+        servers = _CONN_LOCAL.__dict__.get("servers", {})
+        if servers.get(self._conn_key) is server:
+            del servers[self._conn_key]
+        with _CONN_LOCK:
+            _CONNECTIONS[:] = [(k, srv) for k, srv in _CONNECTIONS if srv is not server]
+        _quit_quietly(server)
+
+    def authenticate(self) -> bool:
+        """Conecta e autentica (ou valida a conexão já aberta desta thread)."""
+        if not self._can_send():
+            return False
+        smtplib = _smtplib()
+        try:
+            self._get_server()
+            return True
+        except smtplib.SMTPAuthenticationError as e:
+            logger.exception(f"❌ Autenticação SMTP falhou: {e}")
+        except Exception as e:
+            logger.exception(f"❌ Erro ao conectar no SMTP: {e}")
+        return False
+
+    def close(self) -> None:
+        """
+        Encerra (QUIT) a conexão desta thread com este host/usuário. As das outras threads
+        (pool de envio) podem estar no meio de um envio; são fechadas no atexit.
+        """
+        server = _CONN_LOCAL.__dict__.get("servers", {}).get(self._conn_key)
+        if server is not None:
+            self._discard(server)
+
+    def send_email_async(
+        self,
+        subject: str,
+        html_body: str | bytes,
+        list_key: str = "daily_report",
+        attachments: Optional[Iterable[os.PathLike | str]] = None,
+        reply_to: Optional[str] = None,
+    ) -> "Future[bool]":
+        """Agenda send_email no pool de envio e retorna o Future com o resultado."""
+        return _get_executor().submit(self.send_email, subject, html_body, list_key, attachments, reply_to)
+
+    def send_email_many(
+        self,
+        items: Iterable[Dict[str, Any]],
+        abort_ratio: float = 0.33,
+        min_batch_for_abort: int = 30,
+    ) -> List[bool]:
+        """
+        Envia vários e-mails em paralelo; cada item contém os kwargs de send_email.
+        Em lotes com pelo menos `min_batch_for_abort` itens, levanta BatchAbortedError
+        assim que as falhas atingem `abort_ratio` do lote, cancelando o que ainda não começou.
+        """
+        items = list(items)
+        executor = _get_executor()
+        futures = {executor.submit(self.send_email, **kw): i for i, kw in enumerate(items)}
+        results: List[Optional[bool]] = [None] * len(items)
+        can_abort = len(items) >= min_batch_for_abort
+        failures = 0
+        for fut in as_completed(futures):
+            ok = fut.result()
+            results[futures[fut]] = ok
+            if ok:
+                continue
+            failures += 1
+            if can_abort and failures >= len(items) * abort_ratio:
+                not_attempted = [items[i] for f, i in futures.items() if f.cancel()]
+                logger.error(f"❌ Lote abortado: {failures}/{len(items)} falhas; "
+                             f"{len(not_attempted)} e-mail(s) não tentados")
+                raise BatchAbortedError(
+                    f"{failures} de {len(items)} envios falharam", results, not_attempted
+                )
+        return results
@@ -0,0 +1,144 @@
+"""
+Utilitários SMTP compartilhados por EmailManager e SMTPSender: classes SMTP com DNS
+em cache e corrida IPv6/IPv4, e validação/codificação de valores de cabeçalho.
+"""
+from __future__ import annotations
+
+import functools
+import socket
+import threading
+import time
+from email.charset import Charset
+from email.header import Header
+from typing import Dict, List, Optional, Tuple
+
+# Charset reaproveitado na codificação RFC 2047 de cabeçalhos
+_UTF8 = Charset("utf-8")
+
+# Cache TTL de DNS usado só pelas conexões SMTP criadas por smtp_classes (não é global)
+_DNS_TTL_SECONDS = 60.0
+_DNS_CACHE_MAX = 32
+_DNS_CACHE: Dict[Tuple[str, int, int], Tuple[float, list]] = {}
+_DNS_LOCK = threading.Lock()
+
+
+def reject_crlf(value: str) -> str:
+    """Recusa CR/LF em valores de cabeçalho (evita injeção de cabeçalhos como Bcc:)."""
+    if "\r" in value or "\n" in value:
+        raise ValueError(f"Quebra de linha não permitida em cabeçalho: {value!r}")
+    return value
+
+def header_value(value: str) -> str:
+    """ASCII passa direto; o resto vira encoded-word RFC 2047 (utf-8). CR/LF é recusado."""
+    reject_crlf(value)
+    if value.isascii():
+        return value
+    return Header(value, _UTF8).encode()
+
+def _cached_getaddrinfo(host: str, port: int, family: int) -> list:
+    key = (host, port, family)
+    now = time.monotonic()
+    with _DNS_LOCK:
+        hit = _DNS_CACHE.get(key)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+    infos = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+    with _DNS_LOCK:
+        _DNS_CACHE.pop(key, None)
+        if len(_DNS_CACHE) >= _DNS_CACHE_MAX:
+            _DNS_CACHE.pop(next(iter(_DNS_CACHE)))
+        _DNS_CACHE[key] = (now + _DNS_TTL_SECONDS, infos)
+    return infos
+
+def _connect_first(infos: list, timeout, source_address=None) -> socket.socket:
+    """Tenta os endereços em ordem e devolve o primeiro socket conectado."""
+    err: Optional[OSError] = None
+    for af, socktype, proto, _canon, sa in infos:
+        sock = None
+        try:
+            sock = socket.socket(af, socktype, proto)
+            if timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+                sock.settimeout(timeout)
+            if source_address:
+                sock.bind(source_address)
+            sock.connect(sa)
+            return sock
+        except OSError as e:
+            err = e
+            if sock is not None:
+                sock.close()
+    raise err if err is not None else OSError("nenhum endereço para conectar")
+
+def _happy_eyeballs(v6: list, v4: list, timeout, source_address=None) -> socket.socket:
+    """IPv6 e IPv4 em paralelo (uma thread por família): vence o primeiro que conectar."""
+    winner: List[socket.socket] = []
+    errors: List[OSError] = []
+    done = threading.Event()
+    lock = threading.Lock()
+
+    def attempt(infos: list) -> None:
+        try:
+            sock = _connect_first(infos, timeout, source_address)
+        except OSError as e:
+            with lock:
+                errors.append(e)
+                if len(errors) == 2:
+                    done.set()
+            return
+        with lock:
+            if winner:
+                sock.close()  # a outra família chegou antes
+                return
+            winner.append(sock)
+        done.set()
+
+    for infos in (v6, v4):
+        threading.Thread(target=attempt, args=(infos,), daemon=True).start()
+    done.wait()
+    if winner:
+        return winner[0]
+    raise errors[0]
+
+def _create_connection(host: str, port: int, timeout, source_address=None,
+                       family: int = socket.AF_UNSPEC) -> socket.socket:
+    """Como socket.create_connection, mas com família configurável, DNS em cache (TTL)
+    e corrida IPv6/IPv4 (Happy Eyeballs) quando o host tem as duas famílias."""
+    infos = _cached_getaddrinfo(host, port, family)
+    v6 = [i for i in infos if i[0] == socket.AF_INET6]
+    v4 = [i for i in infos if i[0] != socket.AF_INET6]
+    try:
+        if v6 and v4:
+            return _happy_eyeballs(v6, v4, timeout, source_address)
+        return _connect_first(infos, timeout, source_address)
+    except OSError:
+        # Nenhum endereço respondeu: descarta a entrada para forçar novo lookup
+        with _DNS_LOCK:
+            _DNS_CACHE.pop((host, port, family), None)
+        raise
+
+@functools.lru_cache(maxsize=None)
+def smtp_classes(force_ipv4: bool) -> Tuple[type, type]:
+    """(classe STARTTLS, classe SSL) com resolução de nomes em cache; IPv4-only se pedido."""
+    import smtplib  # só no primeiro envio: quem apenas lê a config não paga o import
+
+    class _SMTP(smtplib.SMTP):
+        """SMTP com resolução de nomes em cache; `_family` restringe a família de endereço."""
+        _family = socket.AF_INET if force_ipv4 else socket.AF_UNSPEC
+
+        def _get_socket(self, host, port, timeout):
+            if timeout is not None and not timeout:
+                raise ValueError("Non-blocking socket (timeout=0) is not supported")
+            if self.debuglevel > 0:
+                self._print_debug("connect: to", (host, port), self.source_address)
+            try:
+                return _create_connection(host, port, timeout, self.source_address, self._family)
+            except socket.gaierror:
+                if self._family == socket.AF_UNSPEC:
+                    raise
+                # Sem A-records: cai na resolução padrão
+                return _create_connection(host, port, timeout, self.source_address)
+
+    class _SMTP_SSL(smtplib.SMTP_SSL, _SMTP):
+        """SMTP_SSL sobre o _get_socket de _SMTP (SMTP_SSL só embrulha o socket em TLS)."""
+
+    return _SMTP, _SMTP_SSL
@@ -3,19 +3,61 @@ SMTP Sender - Versão simplificada para envio de e-mails via Gmail
 Substitui a complexidade do OAuth por SMTP simples
 """
 
+import asyncio
+import base64
+import re
 import smtplib
 import os
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
-from typing import List, Optional, Dict, Any
+from email.message import EmailMessage, MIMEPart
+from email.policy import SMTP as SMTP_POLICY
+from email.utils import formatdate
+from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 
+from src.email_sender.smtp_common import header_value, reject_crlf, smtp_classes
 from src.utils.logger import get_logger
 
 logger = get_logger("smtp_sender")
 
+# Validação sintática simples do remetente (mesma regra do EmailManager)
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# Blocos múltiplos de 57 bytes viram linhas base64 completas de 76 chars (sem padding no meio)
+_B64_CHUNK = 57 * 1024
+
+
+# Corpo do e-mail de teste (health check), montado uma vez no import
+_TEST_SUBJECT = "🧪 Teste - Insurance News Agent"
+
+_TEST_HTML = """
+<html>
+<body>
+    <h2>✅ Teste de E-mail Bem-sucedido!</h2>
+    <p>Este é um e-mail de teste do <strong>Insurance News Agent</strong>.</p>
+    <p>Se você recebeu esta mensagem, o sistema de e-mail está funcionando corretamente.</p>
+    <hr>
+    <p><em>Sistema configurado via SMTP</em></p>
+</body>
+</html>
+"""
+
+_TEST_TEXT = """
+✅ Teste de E-mail Bem-sucedido!
+
+Este é um e-mail de teste do Insurance News Agent.
+Se você recebeu esta mensagem, o sistema de e-mail está funcionando corretamente.
+
+Sistema configurado via SMTP
+"""
+
+
+def _to_header(to_emails: List[str]) -> bytes:
+    """Cabeçalho To: em bytes; listas longas são dobradas para respeitar o limite de linha do SMTP"""
+    value = reject_crlf(', '.join(to_emails))
+    if len(value) > 900:
+        value = ',\r\n '.join(to_emails)
+    return f"To: {value}\r\n".encode('utf-8')
+
 
 class SMTPSender:
     """
@@ -34,6 +76,15 @@ class SMTPSender:
         
         self.authenticated = False
         self.logger = logger
+        # Conexão persistente: STARTTLS + LOGIN uma vez só, reaproveitada entre envios
+        self._conn: Optional[smtplib.SMTP] = None
+        
+        # Destinatários por transação SMTP (o Gmail recusa mais de 100 RCPT TO por mensagem)
+        self.recipient_batch_size = 50
+        # Lotes de destinatários que falharam no último envio (para reenviar só esses)
+        self.last_failed_recipients: List[List[str]] = []
+        # Último resultado de validate_configuration, chaveado pelas credenciais
+        self._validation: Optional[Tuple[Tuple[Optional[str], bool], Dict[str, Any]]] = None
         
         if not self.email or not self.password:
             self.logger.error("❌ Credenciais SMTP não configuradas")
@@ -55,13 +106,9 @@ class SMTPSender:
         try:
             self.logger.info("🔐 Testando autenticação SMTP...")
             
-            # Testa conexão
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.email, self.password)
-            server.quit()
+            # Abre (e mantém) a conexão autenticada; NOOP confirma que uma conexão antiga ainda vive
+            self._send(lambda server: server.noop())
             
-            self.authenticated = True
             self.logger.info("✅ Autenticação SMTP bem-sucedida")
             return True
             
@@ -105,62 +152,206 @@ class SMTPSender:
             return False
         
         try:
-            # Cria mensagem
-            msg = MIMEMultipart('alternative')
-            msg['From'] = self.email
-            msg['To'] = ', '.join(to_emails)
-            msg['Subject'] = subject
-            
-            # Adiciona corpo texto (se fornecido)
-            if text_body:
-                text_part = MIMEText(text_body, 'plain', 'utf-8')
-                msg.attach(text_part)
-            
-            # Adiciona corpo HTML
-            html_part = MIMEText(html_body, 'html', 'utf-8')
-            msg.attach(html_part)
-            
-            # Adiciona anexos (se fornecidos)
-            if attachments:
-                for attachment_path in attachments:
-                    if Path(attachment_path).exists():
-                        self._add_attachment(msg, attachment_path)
-                    else:
-                        self.logger.warning(f"Anexo não encontrado: {attachment_path}")
-            
-            # Conecta e envia
-            self.logger.info(f"📧 Enviando e-mail para {len(to_emails)} destinatário(s)...")
-            
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.email, self.password)
-            
-            # Envia para todos os destinatários
-            server.send_message(msg)
-            server.quit()
-            
-            self.logger.info(f"✅ E-mail enviado com sucesso para: {', '.join(to_emails)}")
-            return True
-            
+            raw = self.build_report_message(subject, html_body, text_body, attachments)
         except Exception as e:
-            self.logger.error(f"❌ Erro ao enviar e-mail: {e}")
+            self.logger.error(f"❌ Erro ao montar e-mail: {e}")
             return False
+        
+        return self._send_raw(to_emails, raw)
     
-    def _add_attachment(self, msg: MIMEMultipart, file_path: str):
+    def send_to_groups(self,
+                       recipient_groups: List[List[str]],
+                       subject: str,
+                       html_body: str,
+                       text_body: Optional[str] = None,
+                       attachments: Optional[List[str]] = None) -> List[bool]:
+        """
+        Envia o mesmo conteúdo para vários grupos de destinatários (ex.: um por região);
+        a mensagem é montada e codificada uma vez só, apenas o To: muda por grupo
+        
+        Returns:
+            Lista com o resultado de cada grupo, na ordem de recipient_groups
+        """
+        if not recipient_groups:
+            return []
+        
+        if not self.email or not self.password:
+            self.logger.error("❌ Credenciais não configuradas")
+            return [False] * len(recipient_groups)
+        
+        try:
+            raw = self.build_report_message(subject, html_body, text_body, attachments)
+        except Exception as e:
+            self.logger.error(f"❌ Erro ao montar e-mail: {e}")
+            return [False] * len(recipient_groups)
+        
+        return [self._send_raw(to_emails, raw) for to_emails in recipient_groups]
+    
+    def _send_raw(self, to_emails: List[str], raw: bytes) -> bool:
+        """Envia uma mensagem já serializada (sem To:), acrescentando o cabeçalho To: do envio"""
+        if not to_emails:
+            self.logger.error("❌ Nenhum destinatário especificado")
+            return False
+        
+        # Conecta (ou reaproveita a conexão) e envia; listas grandes vão em lotes de RCPT TO
+        # (limite por transação do Gmail), e só os lotes que falharem ficam para reenvio
+        self.logger.info(f"📧 Enviando e-mail para {len(to_emails)} destinatário(s)...")
+        self.last_failed_recipients = []
+        size = max(1, self.recipient_batch_size)
+        for i in range(0, len(to_emails), size):
+            chunk = to_emails[i:i + size]
+            try:
+                data = _to_header(chunk) + raw
+                self._send(lambda server: server.sendmail(self.email, chunk, data))
+            except Exception as e:
+                self.logger.error(f"❌ Erro ao enviar e-mail para {len(chunk)} destinatário(s): {e}")
+                self.last_failed_recipients.append(chunk)
+        
+        if self.last_failed_recipients:
+            return False
+        
+        self.logger.info(f"✅ E-mail enviado com sucesso para: {', '.join(to_emails)}")
+        return True
+    
+    def send_many(self, items: List[Tuple[List[str], str, str, Optional[str], Optional[List[str]]]]) -> List[bool]:
+        """
+        Envia várias mensagens na mesma sessão SMTP (um único STARTTLS + LOGIN)
+        
+        Args:
+            items: Tuplas (to_emails, subject, html_body, text_body, attachments),
+                   mesmos argumentos de send_email
+            
+        Returns:
+            Lista com o resultado de cada envio, na ordem de items
+        """
+        if not items:
+            return []
+        
+        self.logger.info(f"📧 Enviando lote de {len(items)} e-mail(s) na mesma conexão...")
+        results = [self.send_email(*item) for item in items]
+        self.logger.info(f"📬 Lote concluído: {sum(results)}/{len(results)} enviado(s)")
+        return results
+    
+    def build_report_message(self,
+                             subject: str,
+                             html_body: str,
+                             text_body: Optional[str] = None,
+                             attachments: Optional[List[str]] = None) -> bytes:
+        """
+        Monta a mensagem completa em bytes (CRLF), sem o cabeçalho To:
+        
+        O resultado pode ser reenviado a vários grupos de destinatários (send_to_groups)
+        sem refazer a árvore MIME nem a codificação base64.
+        """
+        if not text_body and not attachments:
+            # Caso comum (só HTML): bytes montados direto, sem a árvore email.mime
+            return self._build_html_message(subject, html_body)
+        
+        # Cria mensagem (API EmailMessage: alternative texto/HTML, vira mixed se houver anexos)
+        msg = EmailMessage()
+        msg['From'] = self.email
+        msg['Subject'] = subject
+        
+        # Corpo texto (se fornecido) + HTML
+        if text_body:
+            msg.set_content(text_body, cte='base64')
+            msg.add_alternative(html_body, subtype='html', cte='base64')
+        else:
+            msg.set_content(html_body, subtype='html', cte='base64')
+        
+        # Adiciona anexos (se fornecidos)
+        if attachments:
+            for attachment_path in attachments:
+                if Path(attachment_path).exists():
+                    self._add_attachment(msg, attachment_path)
+                else:
+                    self.logger.warning(f"Anexo não encontrado: {attachment_path}")
+        
+        # Serialização com CRLF, como o smtplib espera
+        return msg.as_bytes(policy=SMTP_POLICY)
+    
+    def _connect(self) -> smtplib.SMTP:
+        """Retorna a conexão autenticada, abrindo-a (SMTP + STARTTLS + LOGIN) só se necessário"""
+        if self._conn is None:
+            # Mesma classe do EmailManager: DNS em cache (TTL) e corrida IPv6/IPv4 no connect
+            smtp_cls, _ = smtp_classes(False)
+            server = smtp_cls(self.smtp_server, self.smtp_port, timeout=30)
+            try:
+                server.starttls()
+                server.login(self.email, self.password)
+            except Exception:
+                server.close()
+                raise
+            self._conn = server
+            self.authenticated = True
+            self.logger.debug("🔌 Conexão SMTP aberta")
+        return self._conn
+    
+    def _send(self, action) -> None:
+        """Executa o envio na conexão persistente; se o servidor derrubou a sessão, reconecta uma vez"""
+        try:
+            action(self._connect())
+        except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError):
+            self.logger.debug("🔄 Conexão SMTP caiu, reconectando...")
+            self._drop()
+            action(self._connect())
+    
+    def _drop(self):
+        """Descarta a conexão atual sem QUIT (usado quando ela já está morta)"""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+    
+    def close(self):
+        """Encerra a conexão SMTP persistente (QUIT)"""
+        if self._conn is not None:
+            try:
+                self._conn.quit()
+            except Exception:
+                pass
+            self._drop()
+            self.logger.debug("🔌 Conexão SMTP encerrada")
+    
+    def __enter__(self) -> "SMTPSender":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def _build_html_message(self, subject: str, html_body: str) -> bytes:
+        """Mensagem text/html simples em bytes (RFC 5322, sem To:), sem passar pelo email.generator"""
+        headers = (
+            f"From: {self.email}\r\n"
+            f"Subject: {header_value(subject)}\r\n"
+            f"Date: {formatdate(localtime=True)}\r\n"
+            "MIME-Version: 1.0\r\n"
+            'Content-Type: text/html; charset="utf-8"\r\n'
+            "Content-Transfer-Encoding: base64\r\n\r\n"
+        )
+        # base64 (e não 8bit): HTML gerado pode ter linhas > 998 bytes, limite do SMTP
+        return headers.encode('utf-8') + base64.encodebytes(html_body.encode('utf-8')).replace(b"\n", b"\r\n")
+    
+    def _add_attachment(self, msg: EmailMessage, file_path: str):
         """Adiciona anexo à mensagem"""
         try:
+            # Codifica em blocos: não mantém o arquivo inteiro + a cópia codificada em memória
+            encoded = []
             with open(file_path, 'rb') as attachment:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(attachment.read())
-            
-            encoders.encode_base64(part)
+                while chunk := attachment.read(_B64_CHUNK):
+                    encoded.append(base64.encodebytes(chunk).decode('ascii'))
             
             filename = Path(file_path).name
-            part.add_header(
-                'Content-Disposition',
-                f'attachment; filename= {filename}'
-            )
+            part = MIMEPart()
+            part['Content-Type'] = 'application/octet-stream'
+            # Payload já está em base64; não passa pelo content manager (que releria tudo em memória)
+            part['Content-Transfer-Encoding'] = 'base64'
+            part['Content-Disposition'] = f'attachment; filename="{filename}"'
+            part.set_payload("".join(encoded))
             
+            msg.make_mixed()
             msg.attach(part)
             self.logger.debug(f"Anexo adicionado: {filename}")
             
@@ -174,6 +365,10 @@ class SMTPSender:
         Returns:
             Dicionário com status da validação
         """
+        key = (self.email, bool(self.password))
+        if self._validation is not None and self._validation[0] == key:
+            return dict(self._validation[1], issues=list(self._validation[1]['issues']))
+        
         issues = []
         
         if not self.email:
@@ -182,10 +377,10 @@ class SMTPSender:
         if not self.password:
             issues.append("GMAIL_APP_PASSWORD não configurado")
         
-        if self.email and '@' not in self.email:
+        if self.email and not _EMAIL_RE.match(self.email):
             issues.append("GMAIL_EMAIL inválido")
         
-        return {
+        result = {
             'valid': len(issues) == 0,
             'issues': issues,
             'email_configured': bool(self.email),
@@ -193,6 +388,9 @@ class SMTPSender:
             'smtp_server': self.smtp_server,
             'smtp_port': self.smtp_port
         }
+        # Health checks chamam isto repetidamente; só revalida se as credenciais mudarem
+        self._validation = (key, result)
+        return dict(result, issues=list(issues))
     
     def send_test_email(self, to_email: str) -> bool:
         """
@@ -204,27 +402,125 @@ class SMTPSender:
         Returns:
             True se teste bem-sucedido
         """
-        subject = "🧪 Teste - Insurance News Agent"
+        return self.send_email([to_email], _TEST_SUBJECT, _TEST_HTML, _TEST_TEXT)
+
+
+def _aiosmtplib():
+    """aiosmtplib é opcional: None se não estiver instalado"""
+    try:
+        import aiosmtplib
+    except ImportError:
+        return None
+    return aiosmtplib
+
+
+class AsyncSMTPSender:
+    """
+    Envio SMTP sem bloquear o event loop (para uso dentro de serviços asyncio)
+    
+    Usa aiosmtplib quando instalado; sem ele, o SMTPSender síncrono roda numa thread
+    (asyncio.to_thread). A sessão SMTP é sequencial: envios concorrentes na mesma
+    instância são serializados — o ganho é não travar as outras corrotinas.
+    """
+    
+    def __init__(self):
+        """Inicializa o sender assíncrono (mensagens montadas pelo SMTPSender)"""
+        self._sender = SMTPSender()
+        self.logger = logger
+        self._conn = None
+        self._lock: Optional[asyncio.Lock] = None
+    
+    async def _connect(self):
+        """Conexão aiosmtplib autenticada, aberta só quando necessário"""
+        if self._conn is None or not self._conn.is_connected:
+            aiosmtplib = _aiosmtplib()
+            smtp = aiosmtplib.SMTP(
+                hostname=self._sender.smtp_server,
+                port=self._sender.smtp_port,
+                start_tls=True,
+                timeout=30
+            )
+            await smtp.connect()
+            await smtp.login(self._sender.email, self._sender.password)
+            self._conn = smtp
+            self.logger.debug("🔌 Conexão SMTP assíncrona aberta")
+        return self._conn
+    
+    async def send_email(self,
+                         to_emails: List[str],
+                         subject: str,
+                         html_body: str,
+                         text_body: Optional[str] = None,
+                         attachments: Optional[List[str]] = None) -> bool:
+        """
+        Envia e-mail via SMTP sem bloquear o event loop (mesmos argumentos de SMTPSender.send_email)
         
-        html_body = """
-        <html>
-        <body>
-            <h2>✅ Teste de E-mail Bem-sucedido!</h2>
-            <p>Este é um e-mail de teste do <strong>Insurance News Agent</strong>.</p>
-            <p>Se você recebeu esta mensagem, o sistema de e-mail está funcionando corretamente.</p>
-            <hr>
-            <p><em>Sistema configurado via SMTP</em></p>
-        </body>
-        </html>
+        Returns:
+            True se envio bem-sucedido
         """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
         
-        text_body = """
-        ✅ Teste de E-mail Bem-sucedido!
+        if _aiosmtplib() is None:
+            # Fallback: a conexão do SMTPSender não é thread-safe, um envio por vez
+            async with self._lock:
+                return await asyncio.to_thread(
+                    self._sender.send_email, to_emails, subject, html_body, text_body, attachments
+                )
         
-        Este é um e-mail de teste do Insurance News Agent.
-        Se você recebeu esta mensagem, o sistema de e-mail está funcionando corretamente.
+        sender = self._sender
+        if not sender.email or not sender.password:
+            self.logger.error("❌ Credenciais não configuradas")
+            return False
         
-        Sistema configurado via SMTP
-        """
+        if not to_emails:
+            self.logger.error("❌ Nenhum destinatário especificado")
+            return False
+        
+        try:
+            # Montagem MIME/base64 é CPU e pode ler anexos do disco: fora do event loop
+            raw = await asyncio.to_thread(sender.build_report_message, subject, html_body, text_body, attachments)
+        except Exception as e:
+            self.logger.error(f"❌ Erro ao montar e-mail: {e}")
+            return False
         
-        return self.send_email([to_email], subject, html_body, text_body)
+        self.logger.info(f"📧 Enviando e-mail para {len(to_emails)} destinatário(s)...")
+        failed = []
+        size = max(1, sender.recipient_batch_size)
+        async with self._lock:
+            for i in range(0, len(to_emails), size):
+                chunk = to_emails[i:i + size]
+                try:
+                    data = _to_header(chunk) + raw
+                    try:
+                        await (await self._connect()).sendmail(sender.email, chunk, data)
+                    except _aiosmtplib().SMTPServerDisconnected:
+                        # Servidor derrubou a sessão ociosa: reconecta uma vez
+                        self._conn = None
+                        await (await self._connect()).sendmail(sender.email, chunk, data)
+                except Exception as e:
+                    self.logger.error(f"❌ Erro ao enviar e-mail para {len(chunk)} destinatário(s): {e}")
+                    failed.append(chunk)
+        
+        sender.last_failed_recipients = failed
+        if failed:
+            return False
+        
+        self.logger.info(f"✅ E-mail enviado com sucesso para: {', '.join(to_emails)}")
+        return True
+    
+    async def close(self):
+        """Encerra as conexões SMTP (assíncrona e, se usada, a síncrona do fallback)"""
+        if self._conn is not None:
+            try:
+                await self._conn.quit()
+            except Exception:
+                pass
+            self._conn = None
+        await asyncio.to_thread(self._sender.close)
+    
+    async def __aenter__(self) -> "AsyncSMTPSender":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
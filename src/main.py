@@ -3,33 +3,61 @@ Sistema principal do Insurance News Agent
 VERSÃO COM DEDUPLICAÇÃO INTEGRADA
 """
 
-import asyncio
-from typing import List, Dict, Any
+import threading
+from collections import Counter
+from itertools import chain
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from datetime import datetime
+from urllib.parse import urlparse
 import time
 
 from src.models import NewsArticle, ScrapingResult
-from src.scrapers import ScraperFactory
 from src.analyzers import NewsAnalyzer, ReportGenerator
 from src.utils.config_loader import config_loader
 from src.utils.logger import get_logger
-
-# Importa o sistema de deduplicação
-import sys
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent))
-from deduplication_manager import DeduplicationManager
+from src.deduplication import DeduplicationManager
 
 logger = get_logger("main")
 
+# Limite de fontes raspadas em paralelo (cada uma bloqueia no próprio socket)
+_MAX_SCRAPE_WORKERS = 16
+
+
+class _HostThrottle:
+    """Espaça acessos ao mesmo domínio (prazo contado do fim do anterior); domínios diferentes não esperam"""
+    
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Tuple[threading.Lock, List[float]]] = {}
+    
+    @contextmanager
+    def slot(self, url: str):
+        """
+        Reserva o host de url durante o bloco: espera até delay segundos após o fim do último
+        acesso a ele; fontes no mesmo domínio rodam uma de cada vez, domínios distintos em paralelo
+        """
+        host = urlparse(url or '').netloc.lower()
+        with self._lock:
+            host_lock, last = self._hosts.setdefault(host, (threading.Lock(), [float('-inf')]))
+        with host_lock:
+            remaining = last[0] + self.delay - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+            try:
+                yield
+            finally:
+                last[0] = time.monotonic()
+
 
 class InsuranceNewsAgent:
     """Agente principal para coleta e processamento de notícias de seguros"""
     
     def __init__(self):
         """Inicializa o agente de notícias"""
-        self.config = config_loader.load_sources_config()
-        self.global_settings = config_loader.get_global_settings()
+        self.refresh_config()
         self.analyzer = NewsAnalyzer()
         self.report_generator = ReportGenerator()
         
@@ -38,6 +66,12 @@ class InsuranceNewsAgent:
         
         logger.info("Insurance News Agent inicializado com sistema de deduplicação")
     
+    def refresh_config(self):
+        """Relê sources.yaml e recalcula as fontes habilitadas usadas por todos os pontos de entrada"""
+        self.config = config_loader.load_sources_config()
+        self.global_settings = config_loader.get_global_settings()
+        self._enabled_sources = config_loader.get_enabled_sources()
+    
     def run_daily_collection(self) -> Dict[str, Any]:
         """
         Executa coleta diária de notícias COM DEDUPLICAÇÃO
@@ -52,47 +86,46 @@ class InsuranceNewsAgent:
         # Limpeza automática do histórico (mantém 30 dias)
         self.deduplication_manager.cleanup_old_entries(days_to_keep=30)
         
-        # Coleta notícias de todas as fontes
-        all_articles = []
+        # Coleta notícias de todas as fontes; cada resultado é deduplicado assim que chega
+        unique_by_source: Dict[str, List[NewsArticle]] = {}
         scraping_results = []
+        successful_sources = 0
+        total_collected = 0
         
-        enabled_sources = config_loader.get_enabled_sources()
+        enabled_sources = self._enabled_sources
         
         logger.info(f"📡 Coletando de {len(enabled_sources)} fontes habilitadas")
-        
-        for source_name, source_config in enabled_sources.items():
-            try:
-                logger.info(f"🔍 Processando fonte: {source_name}")
-                
-                # Cria scraper para a fonte
-                scraper = ScraperFactory.create_scraper(source_config)
-                
-                # Executa scraping
-                result = scraper.scrape()
-                scraping_results.append(result)
-                
-                if result.success:
-                    all_articles.extend(result.articles)
-                    logger.info(f"✅ {source_name}: {result.articles_found} artigos coletados "
-                               f"em {result.execution_time:.2f}s")
-                else:
-                    logger.error(f"❌ {source_name}: {result.error_message}")
-                
-                # Delay entre fontes para ser respeitoso
-                time.sleep(self.global_settings.get('delay_between_requests', 2))
-                
-            except Exception as e:
-                logger.error(f"💥 Erro ao processar fonte {source_name}: {e}")
+        logger.info("🔍 Aplicando filtro de deduplicação conforme as fontes terminam...")
+        
+        def dedup_result(source_name: str, result: ScrapingResult):
+            nonlocal total_collected
+            if not result.success:
+                return
+            total_collected += len(result.articles)
+            unique_by_source[source_name] = self.deduplication_manager.filter_duplicates(result.articles)
+            # Libera a lista bruta; só os únicos seguem no pipeline
+            result.articles = []
+        
+        results = self._scrape_all(enabled_sources, self.global_settings.get('delay_between_requests', 2),
+                                   on_result=dedup_result)
+        
+        # Agrega na ordem da configuração (saída determinística, independente de quem terminou antes)
+        article_chunks: List[List[NewsArticle]] = []
+        for source_name in enabled_sources:
+            result, _ = results[source_name]
+            if result is None:
                 continue
+            scraping_results.append(result)
+            if result.success:
+                successful_sources += 1
+                article_chunks.append(unique_by_source.pop(source_name, []))
         
-        logger.info(f"📊 Total coletado: {len(all_articles)} artigos de {len(scraping_results)} fontes")
+        unique_articles = list(chain.from_iterable(article_chunks))
         
-        # APLICAR DEDUPLICAÇÃO
-        logger.info("🔍 Aplicando filtro de deduplicação...")
-        unique_articles = self.deduplication_manager.filter_duplicates(all_articles)
+        logger.info(f"📊 Total coletado: {total_collected} artigos de {len(scraping_results)} fontes")
         
-        if len(unique_articles) < len(all_articles):
-            duplicates_removed = len(all_articles) - len(unique_articles)
+        duplicates_removed = total_collected - len(unique_articles)
+        if duplicates_removed:
             logger.info(f"🗑️ Removidos {duplicates_removed} artigos duplicados")
         
         # Análise e geração de relatório
@@ -101,13 +134,16 @@ class InsuranceNewsAgent:
         # Gera relatório diário
         daily_report = self.report_generator.generate_daily_report(unique_articles)
         
-        # Salva relatório
-        html_path = self.report_generator.save_report(daily_report, format='html')
-        json_path = self.report_generator.save_report(daily_report, format='json')
-        
-        # MARCA ARTIGOS COMO ENVIADOS
-        logger.info("📝 Marcando artigos como enviados no histórico...")
-        self.deduplication_manager.mark_as_sent(unique_articles)
+        # Salva relatório (HTML e JSON numa chamada, em outra thread) enquanto o histórico é gravado nesta
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="report") as executor:
+            fut_paths = executor.submit(self.report_generator.save_report_multi, daily_report, ('html', 'json'))
+            
+            # MARCA ARTIGOS COMO ENVIADOS
+            logger.info("📝 Marcando artigos como enviados no histórico...")
+            self.deduplication_manager.mark_as_sent(unique_articles)
+            
+            paths = fut_paths.result()
+        html_path, json_path = paths['html'], paths['json']
         
         execution_time = time.time() - start_time
         
@@ -119,10 +155,10 @@ class InsuranceNewsAgent:
             'success': True,
             'execution_time': execution_time,
             'total_sources_processed': len(scraping_results),
-            'successful_sources': sum(1 for r in scraping_results if r.success),
-            'total_articles_collected': len(all_articles),
+            'successful_sources': successful_sources,
+            'total_articles_collected': total_collected,
             'unique_articles_after_dedup': len(unique_articles),
-            'duplicates_removed': len(all_articles) - len(unique_articles),
+            'duplicates_removed': duplicates_removed,
             'top_articles_count': len(daily_report.top_articles),
             'other_articles_count': len(getattr(daily_report, 'other_articles', [])),
             'open_insurance_count': len(daily_report.open_insurance_articles),
@@ -137,6 +173,68 @@ class InsuranceNewsAgent:
         
         return result
     
+    def _scrape_all(self, sources: Dict[str, Dict[str, Any]], delay: float,
+                    action: str = "Processando",
+                    on_result: Optional[Callable[[str, ScrapingResult], None]] = None
+                    ) -> Dict[str, Tuple[Optional[ScrapingResult], Optional[str]]]:
+        """
+        Raspa as fontes em paralelo; o delay de cortesia vale por domínio
+        
+        Args:
+            on_result: chamado nesta thread para cada resultado, na ordem em que as fontes terminam
+        
+        Returns:
+            {source_name: (resultado, erro)} — resultado é None se a fonte falhou com exceção
+        """
+        throttle = _HostThrottle(delay)
+        results = {}
+        if not sources:
+            return results
+        
+        workers = min(_MAX_SCRAPE_WORKERS, len(sources))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape") as executor:
+            futures = [
+                executor.submit(self._scrape_one, source_name, source_config, throttle, action)
+                for source_name, source_config in sources.items()
+            ]
+            for future in as_completed(futures):
+                source_name, result, error = future.result()
+                if on_result and result is not None:
+                    on_result(source_name, result)
+                results[source_name] = (result, error)
+        return results
+    
+    def _scrape_one(self, source_name: str, source_config: Dict[str, Any], throttle: _HostThrottle,
+                    action: str = "Processando") -> Tuple[str, Optional[ScrapingResult], Optional[str]]:
+        """
+        Raspa uma fonte (executado numa thread do pool)
+        
+        Returns:
+            (source_name, resultado, erro) — resultado é None se a fonte falhou com exceção
+        """
+        try:
+            logger.info(f"🔍 {action} fonte: {source_name}")
+            
+            # Cria scraper para a fonte (import tardio: requests/bs4/feedparser só quando há scraping)
+            from src.scrapers import ScraperFactory
+            scraper = ScraperFactory.create_scraper(source_config)
+            
+            # Executa scraping, respeitando o intervalo entre acessos ao mesmo domínio
+            with throttle.slot(source_config.get('url', '')):
+                result = scraper.scrape()
+            
+            if result.success:
+                logger.info(f"✅ {source_name}: {result.articles_found} artigos coletados "
+                           f"em {result.execution_time:.2f}s")
+            else:
+                logger.error(f"❌ {source_name}: {result.error_message}")
+            
+            return source_name, result, None
+            
+        except Exception as e:
+            logger.error(f"💥 Erro ao processar fonte {source_name}: {e}")
+            return source_name, None, str(e)
+    
     def collect_from_source(self, source_name: str) -> ScrapingResult:
         """
         Coleta notícias de uma fonte específica
@@ -149,7 +247,7 @@ class InsuranceNewsAgent:
         """
         logger.info(f"🎯 Coletando de fonte específica: {source_name}")
         
-        enabled_sources = config_loader.get_enabled_sources()
+        enabled_sources = self._enabled_sources
         
         if source_name not in enabled_sources:
             error_msg = f"Fonte '{source_name}' não encontrada ou não habilitada"
@@ -163,6 +261,7 @@ class InsuranceNewsAgent:
         
         try:
             source_config = enabled_sources[source_name]
+            from src.scrapers import ScraperFactory
             scraper = ScraperFactory.create_scraper(source_config)
             result = scraper.scrape()
             
@@ -195,39 +294,29 @@ class InsuranceNewsAgent:
         """
         logger.info("🧪 Testando todas as fontes configuradas")
         
-        enabled_sources = config_loader.get_enabled_sources()
+        enabled_sources = self._enabled_sources
         test_results = {}
         
-        for source_name, source_config in enabled_sources.items():
-            try:
-                logger.info(f"🔍 Testando fonte: {source_name}")
-                
-                scraper = ScraperFactory.create_scraper(source_config)
-                result = scraper.scrape()
-                
-                test_results[source_name] = {
-                    'success': result.success,
-                    'articles_found': result.articles_found,
-                    'execution_time': result.execution_time,
-                    'error_message': result.error_message if not result.success else None
-                }
-                
-                if result.success:
-                    logger.info(f"✅ {source_name}: {result.articles_found} artigos")
-                else:
-                    logger.error(f"❌ {source_name}: {result.error_message}")
-                
-                # Delay entre testes
-                time.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"💥 Erro ao testar {source_name}: {e}")
+        # Mesmo pool da coleta diária: o tempo total é o da fonte mais lenta, não a soma
+        results = self._scrape_all(enabled_sources, 1, action="Testando")
+        
+        for source_name in enabled_sources:
+            result, error = results[source_name]
+            if result is None:
                 test_results[source_name] = {
                     'success': False,
                     'articles_found': 0,
                     'execution_time': 0,
-                    'error_message': str(e)
+                    'error_message': error
                 }
+                continue
+            
+            test_results[source_name] = {
+                'success': result.success,
+                'articles_found': result.articles_found,
+                'execution_time': result.execution_time,
+                'error_message': result.error_message if not result.success else None
+            }
         
         successful_sources = sum(1 for r in test_results.values() if r['success'])
         
@@ -245,19 +334,17 @@ class InsuranceNewsAgent:
         Returns:
             Estatísticas do sistema
         """
-        enabled_sources = config_loader.get_enabled_sources()
+        enabled_sources = self._enabled_sources
         
         # Estatísticas por região
-        by_region = {}
-        for source_config in enabled_sources.values():
-            region = source_config.get('region', 'Não especificado')
-            by_region[region] = by_region.get(region, 0) + 1
+        by_region = dict(Counter(
+            source_config.get('region', 'Não especificado') for source_config in enabled_sources.values()
+        ))
         
         # Estatísticas por tipo
-        by_type = {}
-        for source_config in enabled_sources.values():
-            source_type = source_config.get('source_type', 'Não especificado')
-            by_type[source_type] = by_type.get(source_type, 0) + 1
+        by_type = dict(Counter(
+            source_config.get('source_type', 'Não especificado') for source_config in enabled_sources.values()
+        ))
         
         # Estatísticas de deduplicação
         dedup_stats = self.deduplication_manager.get_statistics()
@@ -30,7 +30,7 @@ class SourceType(Enum):
     API = "api"
 
 
-@dataclass
+@dataclass(slots=True)
 class NewsSource:
     """Configuração de uma fonte de notícias"""
     name: str
@@ -44,7 +44,7 @@ class NewsSource:
     enabled: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class NewsArticle:
     """Artigo de notícia coletado"""
     title: str
@@ -69,7 +69,7 @@ class NewsArticle:
             raise ValueError("Fonte é obrigatória")
 
 
-@dataclass
+@dataclass(slots=True)
 class DailyReport:
     """Relatório diário consolidado"""
     date: datetime
@@ -78,6 +78,8 @@ class DailyReport:
     top_articles: List[NewsArticle]
     open_insurance_articles: List[NewsArticle]
     summary: str = ""
+    # Artigos fora do top, preenchido pelo ReportGenerator (declarado: a classe usa slots)
+    other_articles: List[NewsArticle] = field(default_factory=list)
     
     def __post_init__(self):
         """Calcular estatísticas após inicialização"""
@@ -89,7 +91,7 @@ class DailyReport:
             self.total_articles = sum(self.articles_by_region.values())
 
 
-@dataclass
+@dataclass(slots=True)
 class ScrapingResult:
     """Resultado de uma operação de scraping"""
     source: str
@@ -101,7 +103,7 @@ class ScrapingResult:
     timestamp: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailConfig:
     """Configuração para envio de e-mails"""
     smtp_server: str
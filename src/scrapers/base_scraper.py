@@ -5,7 +5,10 @@ Classe base para todos os scrapers de notícias
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
+import re
+import threading
 import time
+from functools import lru_cache
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -16,6 +19,128 @@ from src.utils.text_processor import text_processor
 
 logger = get_logger("base_scraper")
 
+# Tamanho do pool de conexões por host nas sessões compartilhadas
+_POOL_SIZE = 32
+
+# Sessões HTTP compartilhadas entre scrapers, uma por número de tentativas (retry)
+_SESSIONS: Dict[int, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _html_parser() -> str:
+    """Parser do BeautifulSoup: lxml (libxml2, em C) se instalado, senão o html.parser puro Python"""
+    try:
+        import lxml
+        return 'lxml'
+    except ImportError:
+        logger.warning("⚠️ lxml não instalado - usando html.parser (mais lento)")
+        return 'html.parser'
+
+
+# Formatos comuns de data (tentados em ordem após o caminho rápido ISO-8601)
+_DATE_FORMATS = (
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y',
+    '%d de %B de %Y',
+    '%B %d, %Y',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%dT%H:%M:%SZ',
+)
+
+# Mapeamento de meses em português, substituídos numa única passada de regex
+_MONTH_MAP = {
+    'janeiro': 'January', 'fevereiro': 'February', 'março': 'March',
+    'abril': 'April', 'maio': 'May', 'junho': 'June',
+    'julho': 'July', 'agosto': 'August', 'setembro': 'September',
+    'outubro': 'October', 'novembro': 'November', 'dezembro': 'December'
+}
+_MONTH_RE = re.compile('|'.join(_MONTH_MAP))
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_cached(date_str: str) -> Optional[datetime]:
+    """
+    Parse de data com cache (feeds repetem muito as mesmas datas); None se nenhum formato servir
+    
+    Datas ISO-8601 (maioria nos RSS) vão por datetime.fromisoformat, em C, sem a cascata
+    de strptime + ValueError. O resultado é sempre naive: datas com fuso (Z, +03:00) são
+    convertidas para o horário local, o mesmo de datetime.now() usado no corte por idade.
+    """
+    iso = date_str.strip()
+    
+    if len(iso) >= 10 and iso[4] == '-' and iso[:4].isdigit():
+        try:
+            parsed = datetime.fromisoformat(iso)
+        except ValueError:
+            pass
+        else:
+            if parsed.tzinfo is None:
+                return parsed
+            return parsed.astimezone().replace(tzinfo=None)
+    
+    # Fallback por formatos: minúsculas só aqui (meses em português)
+    date_str_en = iso.lower()
+    
+    # Substitui meses em português
+    date_str_en = _MONTH_RE.sub(lambda m: _MONTH_MAP[m.group(0)], date_str_en)
+    
+    # Tenta parsear com diferentes formatos
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str_en, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _shared_session(retry_attempts: int) -> requests.Session:
+    """
+    Sessão HTTP reaproveitada por todos os scrapers com a mesma política de retry
+    
+    Scrapers são criados a cada coleta; com uma sessão por instância, cada um refazia
+    o handshake TCP/TLS. O pool compartilhado mantém as conexões keep-alive abertas.
+    """
+    session = _SESSIONS.get(retry_attempts)
+    if session is not None:
+        return session
+    
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(retry_attempts)
+        if session is None:
+            session = requests.Session()
+            
+            # Configura retry strategy
+            retry_strategy = Retry(
+                total=retry_attempts,
+                backoff_factor=1,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["HEAD", "GET", "OPTIONS"]
+            )
+            adapter = HTTPAdapter(
+                pool_connections=_POOL_SIZE,
+                pool_maxsize=_POOL_SIZE,
+                max_retries=retry_strategy
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSIONS[retry_attempts] = session
+    return session
+
+
+def close_sessions():
+    """Fecha as sessões HTTP compartilhadas (libera as conexões keep-alive do pool)"""
+    with _SESSIONS_LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for session in sessions:
+        try:
+            session.close()
+        except Exception as e:
+            logger.debug(f"Erro ao fechar sessão HTTP: {e}")
+
 
 class BaseScraper(ABC):
     """Classe base para todos os scrapers"""
@@ -56,36 +181,19 @@ class BaseScraper(ABC):
         custom_headers = source_config.get('headers', {})
         self.headers.update(custom_headers)
         
-        # Configura sessão HTTP com retry
+        # Sessão HTTP com retry (compartilhada: keep-alive e TLS reaproveitados entre scrapers)
         self.session = self._create_session()
         
         logger.info(f"Scraper inicializado para {self.name} ({self.region.value})")
     
     def _create_session(self) -> requests.Session:
         """
-        Cria sessão HTTP com configurações de retry
+        Retorna a sessão HTTP compartilhada para a política de retry desta fonte
         
         Returns:
             Sessão HTTP configurada
         """
-        session = requests.Session()
-        
-        # Configura retry strategy
-        retry_strategy = Retry(
-            total=self.retry_attempts,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS"]
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        # Define headers padrão
-        session.headers.update(self.headers)
-        
-        return session
+        return _shared_session(self.retry_attempts)
     
     def _make_request(self, url: str, **kwargs) -> Optional[requests.Response]:
         """
@@ -101,6 +209,8 @@ class BaseScraper(ABC):
         try:
             logger.debug(f"Fazendo requisição para: {url}")
             
+            # Headers por requisição: a sessão (e o pool de conexões) é compartilhada entre fontes
+            kwargs.setdefault('headers', self.headers)
             response = self.session.get(
                 url,
                 timeout=self.timeout,
@@ -116,12 +226,13 @@ class BaseScraper(ABC):
             logger.error(f"Erro na requisição para {url}: {e}")
             return None
     
-    def _is_article_recent(self, article_date: datetime) -> bool:
+    def _is_article_recent(self, article_date: datetime, cutoff: Optional[datetime] = None) -> bool:
         """
         Verifica se artigo está dentro do período de interesse
         
         Args:
             article_date: Data do artigo
+            cutoff: Data de corte calculada no início do scrape() (None: calcula agora)
             
         Returns:
             True se artigo é recente
@@ -129,15 +240,36 @@ class BaseScraper(ABC):
         if not article_date:
             return True  # Se não tem data, considera recente
         
-        cutoff_date = datetime.now() - timedelta(days=self.max_age_days)
-        return article_date >= cutoff_date
+        return article_date >= (cutoff or self._recency_cutoff())
     
-    def _process_article(self, raw_article: Dict[str, Any]) -> Optional[NewsArticle]:
+    def parse_html(self, content):
+        """
+        Faz o parsing de uma página HTML com o parser mais rápido disponível
+        
+        Args:
+            content: Conteúdo HTML (bytes ou str)
+            
+        Returns:
+            Objeto BeautifulSoup
+        """
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(content, _html_parser())
+    
+    def _recency_cutoff(self) -> datetime:
+        """
+        Data de corte por idade; scrape() a calcula uma vez e repassa aos artigos
+        (local à chamada: a mesma instância é reaproveitada pelo ScraperFactory)
+        """
+        return datetime.now() - timedelta(days=self.max_age_days)
+    
+    def _process_article(self, raw_article: Dict[str, Any],
+                         cutoff: Optional[datetime] = None) -> Optional[NewsArticle]:
         """
         Processa artigo bruto em NewsArticle
         
         Args:
             raw_article: Dados brutos do artigo
+            cutoff: Data de corte por idade (ver _recency_cutoff)
             
         Returns:
             NewsArticle processado ou None se inválido
@@ -163,12 +295,13 @@ class BaseScraper(ABC):
                 date_published = datetime.now()
             
             # Verifica se artigo é recente
-            if not self._is_article_recent(date_published):
+            if not self._is_article_recent(date_published, cutoff):
                 logger.debug(f"Artigo muito antigo, ignorando: {title}")
                 return None
             
-            # Verifica se é relacionado a seguros
-            if not text_processor.is_insurance_related(title, content):
+            # Verifica se é relacionado a seguros (e, se for, já calcula score e categorias)
+            analysis = text_processor.analyze(title, content)
+            if analysis is None:
                 logger.debug(f"Artigo não relacionado a seguros, ignorando: {title}")
                 return None
             
@@ -181,9 +314,9 @@ class BaseScraper(ABC):
                 date_published=date_published,
                 summary=summary or text_processor.extract_summary(content),
                 content=content,
-                categories=text_processor.categorize_article(title, content),
-                relevance_score=text_processor.calculate_relevance_score(title, content),
-                open_insurance_related=text_processor.is_open_insurance_related(title, content),
+                categories=analysis.categories,
+                relevance_score=analysis.relevance_score,
+                open_insurance_related=analysis.open_insurance_related,
                 language=raw_article.get('language', 'pt' if self.region == Region.BRASIL else 'en')
             )
             
@@ -204,41 +337,16 @@ class BaseScraper(ABC):
         Returns:
             Objeto datetime
         """
-        # Formatos comuns de data
-        date_formats = [
-            '%Y-%m-%d %H:%M:%S',
-            '%Y-%m-%d',
-            '%d/%m/%Y %H:%M:%S',
-            '%d/%m/%Y',
-            '%d de %B de %Y',
-            '%B %d, %Y',
-            '%Y-%m-%dT%H:%M:%S',
-            '%Y-%m-%dT%H:%M:%SZ',
-        ]
-        
-        # Mapeamento de meses em português
-        month_mapping = {
-            'janeiro': 'January', 'fevereiro': 'February', 'março': 'March',
-            'abril': 'April', 'maio': 'May', 'junho': 'June',
-            'julho': 'July', 'agosto': 'August', 'setembro': 'September',
-            'outubro': 'October', 'novembro': 'November', 'dezembro': 'December'
-        }
-        
-        # Substitui meses em português
-        date_str_en = date_str.lower()
-        for pt_month, en_month in month_mapping.items():
-            date_str_en = date_str_en.replace(pt_month, en_month)
-        
-        # Tenta parsear com diferentes formatos
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(date_str_en, fmt)
-            except ValueError:
-                continue
+        if not date_str:
+            logger.warning(f"Não foi possível parsear data: {date_str}")
+            return datetime.now()
         
-        # Se não conseguiu parsear, retorna data atual
-        logger.warning(f"Não foi possível parsear data: {date_str}")
-        return datetime.now()
+        parsed = _parse_date_cached(date_str)
+        if parsed is None:
+            # Se não conseguiu parsear, retorna data atual
+            logger.warning(f"Não foi possível parsear data: {date_str}")
+            return datetime.now()
+        return parsed
     
     def _delay_request(self):
         """Aplica delay entre requisições"""
@@ -45,6 +45,7 @@ class RSScraper(BaseScraper):
         
         try:
             logger.info(f"Iniciando scraping RSS para {self.name}")
+            cutoff = self._recency_cutoff()
             
             # Faz download do RSS feed
             response = self._make_request(self.rss_url)
@@ -74,7 +75,7 @@ class RSScraper(BaseScraper):
                     raw_article = self._extract_article_from_entry(entry)
                     
                     if raw_article:
-                        article = self._process_article(raw_article)
+                        article = self._process_article(raw_article, cutoff)
                         if article:
                             articles.append(article)
                             logger.debug(f"Artigo RSS processado: {article.title}")
@@ -2,9 +2,12 @@
 Factory para criação de scrapers baseado no tipo de fonte
 """
 
-from typing import Dict, Any, Optional
+import atexit
+import json
+import threading
+from typing import Dict, Any, Optional, Tuple
 from src.models import SourceType
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, close_sessions
 from .rss_scraper import RSScraper
 from .web_scraper import WebScraper
 from src.utils.logger import get_logger
@@ -15,8 +18,58 @@ logger = get_logger("scraper_factory")
 class ScraperFactory:
     """Factory para criação de scrapers"""
     
+    # Scrapers já construídos, por nome da fonte: (impressão digital da config, instância).
+    # Scrapers não guardam estado entre scrape() (tudo é local ao método), então uma mesma
+    # instância serve a várias coletas de um processo longo (scheduler).
+    _scraper_cache: Dict[str, Tuple[str, BaseScraper]] = {}
+    _cache_lock = threading.Lock()
+    
     @staticmethod
     def create_scraper(source_config: Dict[str, Any]) -> Optional[BaseScraper]:
+        """
+        Retorna o scraper da fonte, reaproveitando a instância enquanto a configuração não mudar
+        
+        Args:
+            source_config: Configuração da fonte
+            
+        Returns:
+            Instância do scraper apropriado ou None se erro
+        """
+        name = source_config.get('name', 'Unknown')
+        fingerprint = json.dumps(source_config, sort_keys=True, default=str)
+        
+        cached = ScraperFactory._scraper_cache.get(name)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        
+        scraper = ScraperFactory._build_scraper(source_config)
+        if scraper is not None:
+            with ScraperFactory._cache_lock:
+                ScraperFactory._scraper_cache[name] = (fingerprint, scraper)
+        return scraper
+    
+    @staticmethod
+    def invalidate(source_name: Optional[str] = None):
+        """
+        Descarta scrapers em cache (de uma fonte ou de todas), ex.: ao recarregar a configuração
+        
+        Args:
+            source_name: Nome da fonte; None descarta todos
+        """
+        with ScraperFactory._cache_lock:
+            if source_name is None:
+                ScraperFactory._scraper_cache.clear()
+            else:
+                ScraperFactory._scraper_cache.pop(source_name, None)
+    
+    @staticmethod
+    def close_all():
+        """Descarta todos os scrapers em cache e fecha as sessões HTTP compartilhadas (no encerramento)"""
+        ScraperFactory.invalidate()
+        close_sessions()
+    
+    @staticmethod
+    def _build_scraper(source_config: Dict[str, Any]) -> Optional[BaseScraper]:
         """
         Cria scraper apropriado baseado na configuração da fonte
         
@@ -107,3 +160,4 @@ class ScraperFactory:
             return False
 
 
+atexit.register(ScraperFactory.close_all)
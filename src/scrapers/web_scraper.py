@@ -51,6 +51,7 @@ class WebScraper(BaseScraper):
         
         try:
             logger.info(f"Iniciando web scraping para {self.name}")
+            cutoff = self._recency_cutoff()
             
             # Lista de URLs para processar (começando com a URL principal)
             urls_to_process = [self.url]
@@ -76,10 +77,10 @@ class WebScraper(BaseScraper):
                     continue
                 
                 # Parseia HTML
-                soup = BeautifulSoup(response.content, 'html.parser')
+                soup = self.parse_html(response.content)
                 
                 # Extrai artigos da página
-                page_articles = self._extract_articles_from_page(soup, url)
+                page_articles = self._extract_articles_from_page(soup, url, cutoff)
                 articles.extend(page_articles)
                 
                 logger.debug(f"Extraídos {len(page_articles)} artigos da página {page_num + 1}")
@@ -123,13 +124,15 @@ class WebScraper(BaseScraper):
                 execution_time=time.time() - start_time
             )
     
-    def _extract_articles_from_page(self, soup: BeautifulSoup, base_url: str) -> List[Dict[str, Any]]:
+    def _extract_articles_from_page(self, soup: BeautifulSoup, base_url: str,
+                                    cutoff: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """
         Extrai artigos de uma página HTML
         
         Args:
             soup: Objeto BeautifulSoup da página
             base_url: URL base para resolver links relativos
+            cutoff: Data de corte por idade, calculada uma vez no scrape()
             
         Returns:
             Lista de artigos extraídos
@@ -149,7 +152,7 @@ class WebScraper(BaseScraper):
                     
                     if article_data and article_data.get('title') and article_data.get('url'):
                         # Processa o artigo
-                        processed_article = self._process_article(article_data)
+                        processed_article = self._process_article(article_data, cutoff)
                         if processed_article:
                             articles.append(processed_article)
                 
@@ -303,7 +306,7 @@ class WebScraper(BaseScraper):
             if not response:
                 return ""
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.parse_html(response.content)
             
             # Seletores comuns para conteúdo de artigo
             content_selectors = [
@@ -354,7 +357,7 @@ class WebScraper(BaseScraper):
             if not response:
                 return {'error': 'Falha ao acessar página'}
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = self.parse_html(response.content)
             
             results = {}
             
@@ -2,11 +2,32 @@
 Utilitário para carregar configurações do sistema
 """
 
+import copy
 import yaml
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 from pathlib import Path
 
+# Parser em C (libyaml) quando disponível; SafeLoader puro-Python como fallback
+_FastLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# YAMLs já parseados, chaveados por (caminho, mtime_ns, tamanho); editar o arquivo invalida
+_YAML_CACHE: Dict[Tuple[str, int, int], Any] = {}
+
+
+def _load_yaml_cached(path: Path) -> Any:
+    """Carrega um YAML reaproveitando o parse enquanto o arquivo não mudar (retorna cópia)."""
+    abs_path = str(path.absolute())
+    st = os.stat(abs_path)
+    key = (abs_path, st.st_mtime_ns, st.st_size)
+    if key not in _YAML_CACHE:
+        with open(abs_path, 'r', encoding='utf-8') as file:
+            data = yaml.load(file, Loader=_FastLoader)
+        for stale in [k for k in _YAML_CACHE if k[0] == abs_path]:
+            del _YAML_CACHE[stale]
+        _YAML_CACHE[key] = data
+    return copy.deepcopy(_YAML_CACHE[key])
+
 
 class ConfigLoader:
     """Carregador de configurações do sistema"""
@@ -36,8 +57,7 @@ class ConfigLoader:
         if not sources_file.exists():
             raise FileNotFoundError(f"Arquivo de configuração não encontrado: {sources_file}")
         
-        with open(sources_file, 'r', encoding='utf-8') as file:
-            return yaml.safe_load(file)
+        return _load_yaml_cached(sources_file)
     
     def load_email_config(self) -> Dict[str, Any]:
         """
@@ -59,8 +79,7 @@ class ConfigLoader:
                 'use_tls': True
             }
         
-        with open(email_file, 'r', encoding='utf-8') as file:
-            return yaml.safe_load(file)
+        return _load_yaml_cached(email_file)
     
     def get_source_by_name(self, source_name: str) -> Dict[str, Any]:
         """
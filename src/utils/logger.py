@@ -36,6 +36,9 @@ class LoggerSetup:
     def _setup_logging(self):
         """Configura os handlers de logging"""
         
+        # Arquivos usam enqueue=True: a escrita (e rotação/compressão) roda numa thread do
+        # loguru, fora das threads de scraping; o loguru esvazia a fila ao encerrar
+        
         # Console output (apenas INFO e acima)
         logger.add(
             sys.stdout,
@@ -51,7 +54,8 @@ class LoggerSetup:
             level="DEBUG",
             rotation="1 day",
             retention="30 days",
-            compression="zip"
+            compression="zip",
+            enqueue=True
         )
         
         # Arquivo de log de erros (ERROR e acima)
@@ -60,7 +64,8 @@ class LoggerSetup:
             format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
             level="ERROR",
             rotation="1 week",
-            retention="12 weeks"
+            retention="12 weeks",
+            enqueue=True
         )
         
         # Arquivo de log de scraping
@@ -70,7 +75,8 @@ class LoggerSetup:
             level="DEBUG",
             filter=lambda record: "scraper" in record["name"].lower(),
             rotation="1 day",
-            retention="7 days"
+            retention="7 days",
+            enqueue=True
         )
         
         # Arquivo de log de e-mails
@@ -80,7 +86,8 @@ class LoggerSetup:
             level="INFO",
             filter=lambda record: "email" in record["name"].lower(),
             rotation="1 week",
-            retention="4 weeks"
+            retention="4 weeks",
+            enqueue=True
         )
     
     def get_logger(self, name: str = None):
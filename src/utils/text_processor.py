@@ -3,7 +3,8 @@ Processador de texto para análise de relevância e categorização de notícias
 """
 
 import re
-from typing import List, Dict, Tuple
+from dataclasses import dataclass
+from typing import List, Dict, Tuple, Optional
 from datetime import datetime
 import unicodedata
 from src.utils.config_loader import config_loader
@@ -11,6 +12,30 @@ from src.utils.logger import get_logger
 
 logger = get_logger("text_processor")
 
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Categorias baseadas em palavras-chave (busca por substring no texto em minúsculas)
+_CATEGORY_KEYWORDS = {
+    'open_insurance': ('open insurance', 'open banking', 'seguros abertos', 'opin'),
+    'regulation': ('regulamentação', 'susep', 'lei', 'circular', 'resolução', 'normativa'),
+    'technology': ('tecnologia', 'digital', 'api', 'insurtech', 'inovação'),
+    'market': ('mercado', 'setor', 'indústria', 'crescimento', 'vendas'),
+    'claims': ('sinistro', 'indenização', 'claims', 'pagamento'),
+    'auto': ('auto', 'veículo', 'carro', 'automóvel'),
+    'life': ('vida', 'life', 'previdência'),
+    'health': ('saúde', 'health', 'médico', 'hospitalar'),
+    'property': ('patrimonial', 'property', 'residencial', 'empresarial'),
+    'reinsurance': ('resseguro', 'reinsurance', 'ressegurador')
+}
+
+
+@dataclass(slots=True)
+class TextAnalysis:
+    """Resultado de TextProcessor.analyze para um artigo relacionado a seguros"""
+    categories: List[str]
+    relevance_score: float
+    open_insurance_related: bool
+
 
 class TextProcessor:
     """Processador de texto para análise de notícias de seguros"""
@@ -60,11 +85,12 @@ class TextProcessor:
         if not text:
             return ""
         
-        # Remove caracteres de controle
-        text = ''.join(char for char in text if unicodedata.category(char)[0] != 'C')
+        # Remove caracteres de controle (texto imprimível não tem nenhum: pula a varredura por caractere)
+        if not text.isprintable():
+            text = ''.join(char for char in text if unicodedata.category(char)[0] != 'C')
         
         # Normaliza espaços em branco
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         
         # Remove espaços no início e fim
         text = text.strip()
@@ -118,23 +144,64 @@ class TextProcessor:
             Score de relevância (0.0 a 1.0)
         """
         text = f"{title} {content}".lower()
+        return self._score(
+            self._count_matches(self.high_priority_keywords, text),
+            self._count_matches(self.open_insurance_keywords, text),
+            self._count_matches(self.insurance_keywords, text)
+        )
+    
+    @staticmethod
+    def _count_matches(patterns: List[re.Pattern], text: str) -> int:
+        """Quantas palavras-chave (padrões) aparecem no texto"""
+        return sum(1 for pattern in patterns if pattern.search(text))
+    
+    @staticmethod
+    def _score(high_priority_matches: int, open_insurance_matches: int, insurance_matches: int) -> float:
+        """Score de relevância (0.0 a 1.0) a partir das contagens de palavras-chave"""
         score = 0.0
         
         # Pontuação por palavras-chave de alta prioridade
-        high_priority_matches = sum(1 for pattern in self.high_priority_keywords if pattern.search(text))
         score += high_priority_matches * 0.3
         
         # Pontuação por palavras-chave de Open Insurance
-        open_insurance_matches = sum(1 for pattern in self.open_insurance_keywords if pattern.search(text))
         score += open_insurance_matches * 0.4
         
         # Pontuação por palavras-chave gerais de seguros
-        insurance_matches = sum(1 for pattern in self.insurance_keywords if pattern.search(text))
         score += insurance_matches * 0.1
         
         # Normaliza o score para 0-1
         return min(score, 1.0)
     
+    def analyze(self, title: str, content: str = "") -> Optional[TextAnalysis]:
+        """
+        Analisa o artigo numa única passada: relevância para seguros, score, Open Insurance e categorias
+        
+        Equivale a is_insurance_related + calculate_relevance_score + is_open_insurance_related +
+        categorize_article, mas monta o texto em minúsculas uma vez e percorre cada lista de
+        palavras-chave uma vez só.
+        
+        Args:
+            title: Título da notícia
+            content: Conteúdo da notícia
+            
+        Returns:
+            TextAnalysis, ou None se o texto não for relacionado a seguros (nada mais é calculado)
+        """
+        text = f"{title} {content}".lower()
+        
+        insurance_matches = self._count_matches(self.insurance_keywords, text)
+        if not insurance_matches:
+            return None
+        
+        open_insurance_matches = self._count_matches(self.open_insurance_keywords, text)
+        high_priority_matches = self._count_matches(self.high_priority_keywords, text)
+        
+        return TextAnalysis(
+            categories=self._categorize_text(text),
+            relevance_score=self._score(high_priority_matches, open_insurance_matches, insurance_matches),
+            open_insurance_related=open_insurance_matches > 0
+        )
+    
     def is_open_insurance_related(self, title: str, content: str = "") -> bool:
         """
         Verifica se a notícia é relacionada a Open Insurance
@@ -166,28 +233,15 @@ class TextProcessor:
         Returns:
             Lista de categorias
         """
-        text = f"{title} {content}".lower()
-        categories = []
-        
-        # Categorias baseadas em palavras-chave
-        category_keywords = {
-            'open_insurance': ['open insurance', 'open banking', 'seguros abertos', 'opin'],
-            'regulation': ['regulamentação', 'susep', 'lei', 'circular', 'resolução', 'normativa'],
-            'technology': ['tecnologia', 'digital', 'api', 'insurtech', 'inovação'],
-            'market': ['mercado', 'setor', 'indústria', 'crescimento', 'vendas'],
-            'claims': ['sinistro', 'indenização', 'claims', 'pagamento'],
-            'auto': ['auto', 'veículo', 'carro', 'automóvel'],
-            'life': ['vida', 'life', 'previdência'],
-            'health': ['saúde', 'health', 'médico', 'hospitalar'],
-            'property': ['patrimonial', 'property', 'residencial', 'empresarial'],
-            'reinsurance': ['resseguro', 'reinsurance', 'ressegurador']
-        }
-        
-        for category, keywords in category_keywords.items():
-            for keyword in keywords:
-                if keyword in text:
-                    categories.append(category)
-                    break
+        return self._categorize_text(f"{title} {content}".lower())
+    
+    @staticmethod
+    def _categorize_text(text: str) -> List[str]:
+        """Categorias de um texto já em minúsculas"""
+        categories = [
+            category for category, keywords in _CATEGORY_KEYWORDS.items()
+            if any(keyword in text for keyword in keywords)
+        ]
         
         # Se não encontrou categorias específicas, adiciona 'general'
         if not categories:
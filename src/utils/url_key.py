@@ -0,0 +1,45 @@
+"""
+Normalização de URLs para chaves de deduplicação
+"""
+
+import re
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Parâmetros de rastreamento que não mudam o conteúdo da página
+_TRACKING_RE = re.compile(r'^(utm_\w+|fbclid|gclid|mc_cid|mc_eid)$', re.IGNORECASE)
+
+_DEFAULT_PORTS = {'http': ':80', 'https': ':443'}
+
+
+@lru_cache(maxsize=4096)
+def canonical_url(url: str) -> str:
+    """
+    Forma canônica da URL: esquema/host em minúsculas, sem porta padrão, sem fragmento,
+    sem parâmetros de rastreamento (utm_*, fbclid...) e com a query ordenada
+
+    Args:
+        url: URL original
+
+    Returns:
+        URL canônica (a própria entrada se não for http/https)
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS:
+        return url
+
+    netloc = parts.netloc.lower()
+    if netloc.endswith(_DEFAULT_PORTS[scheme]):
+        netloc = netloc[:-len(_DEFAULT_PORTS[scheme])]
+
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_RE.match(key)
+    ))
+
+    return urlunsplit((scheme, netloc, parts.path or '/', query, ''))